@@ -8,7 +8,7 @@ import os
 
 block_cipher = None
 
-# Add Bible data files (graph_data.json and stats.json)
+# Add Bible data files (graph_data.json, stats.json and the binary bundles)
 # These are in parent directory's shared-data folder
 datas = []
 shared_data_path = os.path.join('..', 'shared-data', 'processed')
@@ -17,9 +17,16 @@ if os.path.exists(shared_data_path):
         (os.path.join(shared_data_path, 'graph_data.json'), 'shared-data/processed'),
         (os.path.join(shared_data_path, 'stats.json'), 'shared-data/processed'),
     ]
+    # Optional bundles: graph store, export-metrics and export-layout outputs
+    for bundle in ('graph_data.bin', 'graph_metrics.bin', 'graph_layout.bin'):
+        binary_path = os.path.join(shared_data_path, bundle)
+        if os.path.exists(binary_path):
+            datas.append((binary_path, 'shared-data/processed'))
 
 # Hidden imports for components and key libraries
 hiddenimports = [
+    'graph_store',
+    'graph_binary',
     'components.network_view',
     'components.arc_view',
     'components.heatmap_view',
@@ -32,7 +39,7 @@ hiddenimports = [
 
 a = Analysis(
     ['visualizer_app.py'],
-    pathex=[],
+    pathex=[os.path.join('..', 'shared-data')],  # graph_binary.py, imported by graph_store
     binaries=[],
     datas=datas,
     hiddenimports=hiddenimports,
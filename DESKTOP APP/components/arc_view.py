@@ -1,14 +1,181 @@
 """
 2D Arc Diagram Visualization using Matplotlib
 Beautiful arc-style cross-reference visualization
+
+Full density mode rasterizes every connection, not just the heaviest
+ARC_LIMIT, into an accumulation buffer with NumPy and shows it as a
+log-scaled image, re-rasterized for the visible window on pan and zoom.
 """
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout
+import time
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QCheckBox
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 import numpy as np
 
+from graph_store import chapter_metrics
+
+# Most arcs drawn at once (heaviest first); all go into one LineCollection
+ARC_LIMIT = 10000
+ARC_POINTS = 100
+ARC_ALPHA = 0.3
+OT_COLOR = '#2ecc71'
+NT_COLOR = '#00CED1'
+CROSS_COLOR = '#9370DB'
+
+# Full density mode: arcs set up at a time (heaviest first, so the image
+# fills in from the strongest connections), pieces per half arc (sampled
+# at their own rate, so the steep feet do not set it for the flat top),
+# samples per bincount, GUI-thread time per timer tick, how often the
+# image is blitted while filling in, and how long pan/zoom must pause
+# before the window is re-rasterized
+DENSITY_CHUNK = 10000
+DENSITY_PIECES = 2
+DENSITY_BATCH = 1 << 18
+DENSITY_TICK_MS = 30
+DENSITY_REDRAW_MS = 1000
+DENSITY_DELAY_MS = 150
+DENSITY_CMAP = 'magma'
+
+
+def edge_arrays(connections):
+    """(source, target, weight) integer arrays of a connection list"""
+    count = len(connections)
+    source = np.fromiter((conn['source'] for conn in connections), dtype=np.int64, count=count)
+    target = np.fromiter((conn['target'] for conn in connections), dtype=np.int64, count=count)
+    weight = np.fromiter((conn['weight'] for conn in connections), dtype=np.float64, count=count)
+    return source, target, weight
+
+
+def arc_segments(x1, x2, points=ARC_POINTS):
+    """(E, points, 2) parabolic arcs between x1 and x2, height 0.4 * span (max 100)"""
+    low = np.minimum(x1, x2).astype(np.float64)
+    high = np.maximum(x1, x2).astype(np.float64)
+    height = np.minimum((high - low) * 0.4, 100)
+
+    t = np.linspace(0, 1, points)
+    x = low[:, None] * (1 - t) + high[:, None] * t
+    y = 4 * height[:, None] * t * (1 - t)
+    return np.stack((x, y), axis=-1)
+
+
+def rasterize_arcs(x1, x2, weight, xlim, ylim, shape):
+    """(rows, cols) buffer of summed arc weight per pixel over xlim x ylim"""
+    buffer = np.zeros(shape)
+    for _ in iter_rasterize_arcs(x1, x2, weight, xlim, ylim, buffer):
+        pass
+    return buffer
+
+
+def iter_rasterize_arcs(x1, x2, weight, xlim, ylim, buffer):
+    """Add arc weights over xlim x ylim into the (rows, cols) buffer
+
+    A generator that yields after every sample step, so the GUI can stop
+    after a time budget and resume on the next event-loop turn. Pixels
+    land in the buffer a batch at a time, and all of them once exhausted.
+
+    Each arc is the arc_segments parabola, split into DENSITY_PIECES pieces
+    per half and cut to the part inside xlim and ylim. A piece takes enough
+    samples that no step moves more than one pixel in x or y, and a
+    diagonal step also draws the side pixel the arc cuts through, so arcs
+    have no gaps at any zoom while a zoomed-in window costs no more than
+    the full view. Pieces are sorted by sample count, so sample k is one
+    vectorized step over a prefix of the pieces, with pixel x linear and
+    pixel y quadratic in k.
+    """
+    rows, cols = buffer.shape
+    flat_buffer = buffer.reshape(-1)
+    (left, right), (bottom, top) = xlim, ylim
+    low = np.minimum(x1, x2).astype(np.float64)
+    high = np.maximum(x1, x2).astype(np.float64)
+    span = high - low
+    height = np.minimum(span * 0.4, 100)
+
+    # Parameter range inside xlim, then inside ylim: on the rising half,
+    # y = 4 * height * t * (1 - t) reaches level y at t = (1 - sqrt(1 - y / height)) / 2
+    # (0.5 once y is above the apex), and the falling half mirrors it
+    safe_span = np.where(span > 0, span, 1.0)
+    t_left = np.clip((left - low) / safe_span, 0, 1)
+    t_right = np.clip((right - low) / safe_span, 0, 1)
+    safe_height = np.where(height > 0, height, 1.0)
+    t_bottom = (1 - np.sqrt(np.clip(1 - bottom / safe_height, 0, 1))) / 2
+    t_top = (1 - np.sqrt(np.clip(1 - top / safe_height, 0, 1))) / 2
+    split = np.arange(2 * DENSITY_PIECES) / (2 * DENSITY_PIECES)
+    rising = split < 0.5
+    y_start = np.where(rising, t_bottom[:, None], 1 - t_top[:, None])
+    y_end = np.where(rising, t_top[:, None], 1 - t_bottom[:, None])
+    t_start = np.maximum(np.maximum(t_left[:, None], y_start), split).ravel()
+    t_end = np.minimum(np.minimum(t_right[:, None], y_end), split + split[1]).ravel()
+    arc = np.repeat(np.arange(len(span)), len(split))
+    visible = (span[arc] > 0) & (t_end > t_start) & (high[arc] >= left) & (low[arc] <= right)
+
+    # Per-step pixel moves: x is linear in t, and |dy/dt| = 4 * height * |1 - 2t|
+    # peaks at the piece's end farthest from the apex
+    px = cols / (right - left)
+    py = rows / (top - bottom)
+    steepest = np.maximum(np.abs(1 - 2 * t_start), np.abs(1 - 2 * t_end))
+    moves = (t_end - t_start) * np.maximum(span[arc] * px, 4 * height[arc] * steepest * py)
+    samples = np.maximum(np.ceil(moves), 1).astype(np.int64) + 1
+
+    ids = np.flatnonzero(visible)
+    ids = ids[np.argsort(-samples[ids], kind='stable')]
+    samples = samples[ids]
+    most = int(samples[0]) if len(ids) else 0
+
+    # t = t0 + dt * k for sample k, in pixel units:
+    # col = col0 + col1 * k and row = row0 + (row1 + row2 * k) * k
+    t0 = t_start[ids]
+    dt = (t_end[ids] - t0) / (samples - 1)
+    ids = arc[ids]
+    col0 = (low[ids] + span[ids] * t0 - left) * px
+    col1 = span[ids] * dt * px
+    scaled_height = 4 * height[ids] * py
+    row0 = scaled_height * t0 * (1 - t0) - bottom * py
+    row1 = scaled_height * dt * (1 - 2 * t0)
+    row2 = -scaled_height * dt * dt
+    weight = np.asarray(weight, dtype=np.float64)[ids]
+    # Pieces still sampling at step k: a prefix, since samples is descending
+    active = np.searchsorted(-samples, -np.arange(1, most + 1), side='right')
+
+    # Pieces lie inside the window, so clamping only absorbs rounding at its edges
+    pixels, weights = [], []
+
+    def add(row, col, weights_):
+        pixels.append((np.clip(row, 0, rows - 1) * cols + np.clip(col, 0, cols - 1)).astype(np.int64))
+        weights.append(weights_)
+        return len(row)
+
+    pending = 0
+    for k in range(most):
+        n = active[k]
+        x = col0[:n] + col1[:n] * k
+        y = row0[:n] + (row1[:n] + row2[:n] * k) * k
+        col = np.floor(x)
+        row = np.floor(y)
+        pending += add(row, col, weight[:n])
+        if k:
+            # The chord to the previous sample meets one grid line first;
+            # on a diagonal step that side pixel is covered too
+            diagonal = np.flatnonzero((col != last_col[:n]) & (row != last_row[:n]))
+            x0, y0 = last_x[diagonal], last_y[diagonal]
+            c0, r0 = last_col[diagonal], last_row[diagonal]
+            c1, r1 = col[diagonal], row[diagonal]
+            x_first = ((np.maximum(c0, c1) - x0) / (x[diagonal] - x0)
+                       < (np.maximum(r0, r1) - y0) / (y[diagonal] - y0))
+            pending += add(np.where(x_first, r0, r1), np.where(x_first, c1, c0), weight[diagonal])
+        last_x, last_y, last_col, last_row = x, y, col, row
+        if pending >= DENSITY_BATCH or k == most - 1:
+            flat_buffer += np.bincount(np.concatenate(pixels), weights=np.concatenate(weights),
+                                       minlength=rows * cols)
+            pixels, weights, pending = [], [], 0
+        yield
+
 
 class ArcView(QWidget):
     """Arc diagram visualization component"""
@@ -16,7 +183,26 @@ class ArcView(QWidget):
     def __init__(self):
         super().__init__()
         self.data = None
-        self.filtered_data = None
+        self.chapter_ids = None
+        self.chapter_is_nt = None
+        self.edge_source = None
+        self.edge_target = None
+        self.edge_weight = None
+        self.edge_kind = None
+        self.weight_order = None
+        self.visible_edges = None
+        self.filter_args = ('All', 1)
+        self.density_mode = False
+        self.density_image = None
+        self.density_x1 = None
+        self.density_x2 = None
+        self.density_weight = None
+        self.density_buffer = None
+        self.density_window = None
+        self.density_steps = None
+        self.density_shown = 0.0
+        self.density_overlays = []
+        self.density_background = None
         self.init_ui()
 
     def init_ui(self):
@@ -27,88 +213,145 @@ class ArcView(QWidget):
         # Create matplotlib figure (responsive size)
         self.figure = Figure(facecolor='#1a1a2e')
         self.canvas = FigureCanvas(self.figure)
+        self.canvas.mpl_connect('draw_event', self.on_canvas_draw)
         self.canvas.setSizePolicy(
             self.canvas.sizePolicy().horizontalPolicy(),
             self.canvas.sizePolicy().verticalPolicy()
         )
+
+        # Pan/zoom toolbar and the full density toggle above the canvas
+        toolbar_row = QHBoxLayout()
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        toolbar_row.addWidget(self.toolbar)
+        self.density_checkbox = QCheckBox('Full density (all connections)')
+        self.density_checkbox.setStyleSheet('color: #00CED1;')
+        self.density_checkbox.toggled.connect(self.set_density_mode)
+        toolbar_row.addWidget(self.density_checkbox)
+        layout.addLayout(toolbar_row)
         layout.addWidget(self.canvas)
 
+        # Rasterize for at most DENSITY_TICK_MS per timer tick so the UI
+        # stays responsive; re-rasterize once pan/zoom has paused
+        self.raster_timer = QTimer(self)
+        self.raster_timer.setSingleShot(True)
+        self.raster_timer.timeout.connect(self.continue_density_raster)
+        self.view_timer = QTimer(self)
+        self.view_timer.setSingleShot(True)
+        self.view_timer.setInterval(DENSITY_DELAY_MS)
+        self.view_timer.timeout.connect(self.start_density_raster)
+
         # Set style
         plt.style.use('dark_background')
 
     def set_data(self, data):
         """Set data"""
         self.data = data
-        # PERFORMANCE: Limit to top 1000 connections for arc diagram
-        # Full 190K+ connections will freeze matplotlib
-        limited_data = data.copy()
-        limited_data['connections'] = sorted(
-            data['connections'],
-            key=lambda x: x['weight'],
-            reverse=True
-        )[:1000]
-        self.filtered_data = limited_data
+        self.index_data(data)
+        # PERFORMANCE: Limit to the top ARC_LIMIT connections; the arcs are
+        # one LineCollection, but all 190K+ would still be unreadable
+        self.visible_edges = self.select_edges()
         self.render()
 
+    def index_data(self, data):
+        """Build the chapter and edge arrays used by filtering and rendering, once"""
+        chapters = data['chapters']
+        self.chapter_ids = np.array([ch['id'] for ch in chapters], dtype=np.int64)
+        chapter_nt = np.array([ch['testament'] == 'NT' for ch in chapters], dtype=bool)
+
+        store = data.get('store')
+        if store is not None:
+            source = np.asarray(store.edge_source, dtype=np.int64)
+            target = np.asarray(store.edge_target, dtype=np.int64)
+            weight = np.asarray(store.edge_weight, dtype=np.float64)
+            weight_order = store.weight_order
+        else:
+            source, target, weight = edge_arrays(data['connections'])
+            weight_order = None
+
+        # id -> testament lookup; ids without a chapter never match a filter
+        size = max(self.chapter_ids.max(initial=-1), source.max(initial=-1), target.max(initial=-1)) + 1
+        self.chapter_is_nt = np.zeros(size, dtype=bool)
+        self.chapter_is_nt[self.chapter_ids] = chapter_nt
+        known = np.zeros(size, dtype=bool)
+        known[self.chapter_ids] = True
+
+        self.edge_source, self.edge_target, self.edge_weight = source, target, weight
+        # 0 = OT-OT, 1 = cross-testament, 2 = NT-NT, -1 = unknown chapter
+        self.edge_kind = np.where(known[source] & known[target],
+                                  self.chapter_is_nt[source].astype(np.int8) + self.chapter_is_nt[target],
+                                  -1).astype(np.int8)
+        if weight_order is None:
+            weight_order = np.argsort(-weight, kind='stable')
+        self.weight_order = np.asarray(weight_order)
+
+    def select_edges(self, testament='All', min_weight=1, limit=ARC_LIMIT):
+        """Ids of the heaviest edges passing the filters, as boolean masks"""
+        mask = (self.edge_weight >= min_weight) & (self.edge_kind >= 0)
+        if testament == 'Old Testament':
+            mask &= self.edge_kind == 0
+        elif testament == 'New Testament':
+            mask &= self.edge_kind == 2
+        elif testament == 'Cross-Testament':
+            mask &= self.edge_kind == 1
+        return self.weight_order[mask[self.weight_order]][:limit]
+
     def render(self):
         """Render arc diagram"""
-        if not self.filtered_data:
+        if self.visible_edges is None:
             return
 
         self.figure.clear()
+        self.density_image = None
+        self.density_steps = None
+        self.density_overlays = []
+        self.density_background = None
         ax = self.figure.add_subplot(111)
         ax.set_facecolor('#1a1a2e')
 
-        chapters = self.filtered_data['chapters']
-        connections = self.filtered_data['connections']
+        chapters = self.data['chapters']
+        if self.density_mode:
+            edges = self.select_edges(*self.filter_args, limit=None)
+        else:
+            edges = self.visible_edges
+        source = self.edge_source[edges]
+        target = self.edge_target[edges]
+        weight = self.edge_weight[edges]
 
-        # Create position mapping
-        chapter_positions = {ch['id']: i for i, ch in enumerate(chapters)}
+        # Create position mapping (chapter id -> x position)
         num_chapters = len(chapters)
-
-        # Draw chapter bars at bottom
-        for i, chapter in enumerate(chapters):
-            color = '#2ecc71' if chapter['testament'] == 'OT' else '#00CED1'
-            ax.plot([i, i], [0, 0.05], color=color, linewidth=2, alpha=0.6)
-
-        # Draw arcs
-        max_weight = max(conn['weight'] for conn in connections) if connections else 1
-
-        for conn in connections:
-            source_pos = chapter_positions.get(conn['source'])
-            target_pos = chapter_positions.get(conn['target'])
-
-            if source_pos is None or target_pos is None:
-                continue
-
-            # Calculate arc
-            x1, x2 = source_pos, target_pos
-            if x1 > x2:
-                x1, x2 = x2, x1
-
-            distance = x2 - x1
-            height = min(distance * 0.4, 100)
-
-            # Arc color based on testament
-            source_testament = chapters[source_pos]['testament']
-            target_testament = chapters[target_pos]['testament']
-
-            if source_testament == 'OT' and target_testament == 'OT':
-                color = '#2ecc71'
-            elif source_testament == 'NT' and target_testament == 'NT':
-                color = '#00CED1'
-            else:
-                color = '#9370DB'
-
-            # Arc width based on weight
-            width = np.sqrt(conn['weight']) / 3
-
-            # Draw bezier curve
-            t = np.linspace(0, 1, 100)
-            x = (1 - t) * x1 + t * x2
-            y = 4 * height * t * (1 - t)
-
-            ax.plot(x, y, color=color, linewidth=width, alpha=0.3)
+        chapter_ids = self.chapter_ids
+        positions = np.full(len(self.chapter_is_nt), -1, dtype=np.int64)
+        positions[chapter_ids] = np.arange(num_chapters)
+        is_nt = self.chapter_is_nt[chapter_ids]
+
+        # Draw chapter bars at bottom, taller for higher PageRank when precomputed
+        metrics = chapter_metrics(self.data)
+        bar_heights = np.full(num_chapters, 0.05)
+        if metrics is not None:
+            rank = np.asarray(metrics['pagerank'], dtype=float)[chapter_ids]
+            bar_heights = 0.05 + 6 * np.sqrt(rank / rank.max())
+        ax.vlines(np.arange(num_chapters), 0, bar_heights,
+                  colors=np.where(is_nt, NT_COLOR, OT_COLOR), linewidth=2, alpha=0.6)
+
+        # Draw arcs: every curve in one (E, ARC_POINTS, 2) array and one artist
+        source_pos, target_pos = positions[source], positions[target]
+
+        if self.density_mode:
+            # Filled in by continue_density_raster; empty pixels stay transparent
+            self.density_x1, self.density_x2, self.density_weight = source_pos, target_pos, weight
+            self.density_image = ax.imshow(np.ma.masked_all((1, 1)), cmap=DENSITY_CMAP, origin='lower',
+                                           aspect='auto', interpolation='nearest', zorder=0,
+                                           animated=True)
+        else:
+            # Arc color based on testament: 0 = OT-OT, 1 = cross, 2 = NT-NT
+            palette = np.array([to_rgba(color, ARC_ALPHA)
+                                for color in (OT_COLOR, CROSS_COLOR, NT_COLOR)])
+            kind = self.edge_kind[edges]
+
+            arcs = LineCollection(arc_segments(source_pos, target_pos),
+                                  colors=palette[kind],
+                                  linewidths=np.sqrt(weight) / 3)  # Arc width based on weight
+            ax.add_collection(arcs)
 
         # Add book labels at regular intervals for ultrawide screens
         # Show every Nth book label based on screen width
@@ -119,7 +362,7 @@ class ArcView(QWidget):
             # Always show book name changes
             if chapter['book'] != current_book:
                 current_book = chapter['book']
-                color = '#2ecc71' if chapter['testament'] == 'OT' else '#00CED1'
+                color = OT_COLOR if chapter['testament'] == 'OT' else NT_COLOR
                 ax.text(i, -10, chapter['book'],
                        rotation=90, ha='right', va='top',
                        fontsize=8, color=color, alpha=0.8)
@@ -128,23 +371,135 @@ class ArcView(QWidget):
         ax.set_xlim(-5, num_chapters + 5)
         ax.set_ylim(-15, 120)
         ax.axis('off')
-        ax.set_title(f'Bible Cross-Reference Arc Diagram ({len(connections)} connections shown)',
+        mode = 'full density' if self.density_mode else 'shown'
+        ax.set_title(f'Bible Cross-Reference Arc Diagram ({len(weight)} connections, {mode})',
                      color='#FFD700', fontsize=16, fontweight='bold', pad=20)
 
         # Add legend
         from matplotlib.patches import Patch
         legend_elements = [
-            Patch(facecolor='#2ecc71', label='Old Testament'),
-            Patch(facecolor='#00CED1', label='New Testament'),
-            Patch(facecolor='#9370DB', label='Cross-Testament')
+            Patch(facecolor=OT_COLOR, label='Old Testament'),
+            Patch(facecolor=NT_COLOR, label='New Testament'),
+            Patch(facecolor=CROSS_COLOR, label='Cross-Testament')
         ]
         ax.legend(handles=legend_elements, loc='upper right',
                  facecolor='#16213e', edgecolor='#FFD700')
 
+        if self.density_image is not None:
+            # Full draws skip animated artists; the image and what lies over
+            # it are blitted onto the saved background (the book labels sit
+            # below y = 0, where the image is always transparent)
+            self.density_overlays = [
+                artist for artist in (*ax.collections, ax.get_legend())
+                if artist.get_zorder() > self.density_image.get_zorder()
+            ]
+            for artist in self.density_overlays:
+                artist.set_animated(True)
+
         # Tight layout to use all available space
         self.figure.tight_layout()
         self.canvas.draw()
 
+        if self.density_image is not None:
+            ax.callbacks.connect('xlim_changed', self.on_view_changed)
+            ax.callbacks.connect('ylim_changed', self.on_view_changed)
+            self.start_density_raster()
+
+    def set_density_mode(self, enabled):
+        """Switch between the heaviest ARC_LIMIT arcs and the full density image"""
+        self.density_mode = bool(enabled)
+        if self.data:
+            self.render()
+
+    def on_view_changed(self, ax):
+        """Pan/zoom moved the axes: re-rasterize once the motion pauses
+
+        Until then the current image stays in place, panning and scaling
+        with the axes since its extent is in data coordinates.
+        """
+        self.view_timer.start()
+
+    def start_density_raster(self):
+        """Restart rasterization for the current window at the axes' pixel size"""
+        if self.density_image is None:
+            return
+        ax = self.density_image.axes
+        rows, cols = max(int(ax.bbox.height), 1), max(int(ax.bbox.width), 1)
+        self.density_window = (ax.get_xlim(), ax.get_ylim())
+        self.density_buffer = np.zeros((rows, cols))
+        self.density_steps = self.iter_density_steps()
+        self.density_shown = time.perf_counter()
+        self.raster_timer.start(0)
+
+    def iter_density_steps(self):
+        """Sample steps over all arcs, DENSITY_CHUNK arcs at a time"""
+        xlim, ylim = self.density_window
+        for start in range(0, len(self.density_weight), DENSITY_CHUNK):
+            chunk = slice(start, start + DENSITY_CHUNK)
+            yield from iter_rasterize_arcs(self.density_x1[chunk], self.density_x2[chunk],
+                                           self.density_weight[chunk], xlim, ylim,
+                                           self.density_buffer)
+
+    def continue_density_raster(self):
+        """Rasterize for up to DENSITY_TICK_MS, then yield to the event loop
+
+        The image is redrawn every DENSITY_REDRAW_MS while it fills in and
+        once more when the last arc is done.
+        """
+        if self.density_image is None or self.density_steps is None:
+            return
+        deadline = time.perf_counter() + DENSITY_TICK_MS / 1000
+        finished = True
+        for _ in self.density_steps:
+            if time.perf_counter() >= deadline:
+                finished = False
+                break
+
+        if finished:
+            self.density_steps = None
+            self.show_density()
+        else:
+            if time.perf_counter() - self.density_shown >= DENSITY_REDRAW_MS / 1000:
+                self.show_density()
+            self.raster_timer.start(0)
+
+    def on_canvas_draw(self, event):
+        """A full draw left out the density image: save the background, add the image"""
+        if self.density_image is None or not self.density_image.get_animated():
+            return
+        self.density_background = self.canvas.copy_from_bbox(self.density_image.axes.bbox)
+        self.draw_density_artists()
+
+    def draw_density_artists(self):
+        ax = self.density_image.axes
+        ax.draw_artist(self.density_image)
+        for artist in self.density_overlays:
+            ax.draw_artist(artist)
+
+    def set_density_animated(self, animated):
+        for artist in (self.density_image, *self.density_overlays):
+            artist.set_animated(animated)
+
+    def show_density(self):
+        """Update the image from the accumulation buffer and blit it"""
+        xlim, ylim = self.density_window
+        # Log scaling, as datashader does, so single arcs stay visible
+        # next to pixels crossed by thousands
+        shaded = np.log1p(self.density_buffer)
+        self.density_image.set_data(np.ma.masked_equal(shaded, 0))
+        self.density_image.set_clim(0, max(shaded.max(), 1e-9))
+        # Autoscaling is off once render sets the limits, so this moves
+        # only the image, never the view
+        self.density_image.set_extent((*xlim, *ylim))
+        if self.density_background is None:
+            self.canvas.draw_idle()
+        else:
+            # Only the axes area is repainted, not the labels around it
+            self.canvas.restore_region(self.density_background)
+            self.draw_density_artists()
+            self.canvas.blit(self.density_image.axes.bbox)
+        self.density_shown = time.perf_counter()
+
     def apply_filters(self, filters):
         """Apply filters and re-render"""
         if not self.data:
@@ -153,37 +508,8 @@ class ArcView(QWidget):
         testament = filters.get('testament', 'All')
         min_connections = filters.get('min_connections', 1)
 
-        # Filter connections
-        filtered_connections = []
-        for conn in self.data['connections']:
-            if conn['weight'] < min_connections:
-                continue
-
-            # Get testament info
-            source_ch = next((ch for ch in self.data['chapters'] if ch['id'] == conn['source']), None)
-            target_ch = next((ch for ch in self.data['chapters'] if ch['id'] == conn['target']), None)
-
-            if not source_ch or not target_ch:
-                continue
-
-            source_testament = source_ch['testament']
-            target_testament = target_ch['testament']
-
-            if testament == 'Old Testament' and (source_testament != 'OT' or target_testament != 'OT'):
-                continue
-            elif testament == 'New Testament' and (source_testament != 'NT' or target_testament != 'NT'):
-                continue
-            elif testament == 'Cross-Testament' and source_testament == target_testament:
-                continue
-
-            filtered_connections.append(conn)
-
-        # Update filtered data
-        self.filtered_data = {
-            'chapters': self.data['chapters'],
-            'connections': filtered_connections
-        }
-
+        self.filter_args = (testament, min_connections)
+        self.visible_edges = self.select_edges(testament, min_connections)
         self.render()
 
     def export(self):
@@ -197,4 +523,11 @@ class ArcView(QWidget):
         )
 
         if filename:
-            self.figure.savefig(filename, facecolor='#1a1a2e', dpi=300)
+            # savefig leaves animated artists out, so draw the density image normally
+            if self.density_image is not None:
+                self.set_density_animated(False)
+            try:
+                self.figure.savefig(filename, facecolor='#1a1a2e', dpi=300)
+            finally:
+                if self.density_image is not None:
+                    self.set_density_animated(True)
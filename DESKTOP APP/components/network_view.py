@@ -1,16 +1,54 @@
 """
 3D Network Graph Visualization using Plotly
 Interactive force-directed graph of Bible cross-references
+
+The plot lives in one persistent page that loads plotly.js once; each
+render pushes the new figure into it with runJavaScript.
 """
 
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtCore import QUrl
+import plotly
 import plotly.graph_objects as go
 import networkx as nx
 import numpy as np
+from collections import OrderedDict
 from pathlib import Path
-import tempfile
+
+from graph_store import chapter_metrics, chapter_positions, top_connections
+
+# Node colours by precomputed community (graph_metrics.bin), largest first
+COMMUNITY_COLORS = ['#FFD700', '#00CED1', '#2ecc71', '#e74c3c', '#9370DB',
+                    '#FF8C00', '#3498db', '#FF69B4', '#1abc9c', '#bdc3c7']
+
+# Spring layouts kept for this many filtered node sets (least recently used dropped)
+LAYOUT_CACHE_SIZE = 32
+
+# plotly.js ships inside the plotly package; the page loads it from there
+# (no CDN needed) instead of embedding it in a multi-MB file per render
+PLOTLY_JS_DIR = Path(plotly.__file__).parent / 'package_data'
+
+NETWORK_PAGE = """
+<html>
+<head>
+    <style>
+        body { background: #1a1a2e; margin: 0; }
+        #network { width: 100vw; height: 100vh; }
+    </style>
+    <script src="plotly.min.js"></script>
+</head>
+<body>
+    <div id="network"></div>
+    <script>
+        // Called from NetworkView.push_figure with a plotly figure dict
+        function updateNetwork(figure) {
+            Plotly.react('network', figure.data, figure.layout, {responsive: true});
+        }
+    </script>
+</body>
+</html>
+"""
 
 
 class NetworkView(QWidget):
@@ -20,6 +58,13 @@ class NetworkView(QWidget):
         super().__init__()
         self.data = None
         self.graph = None
+        self.metrics = None
+        self.positions = None
+        self.figure = None
+        self.layout_cache = OrderedDict()
+        self.page_loading = False
+        self.page_ready = False
+        self.pending_figure = None
         self.init_ui()
 
     def init_ui(self):
@@ -36,11 +81,15 @@ class NetworkView(QWidget):
 
     def show_placeholder(self):
         """Show loading placeholder"""
-        html = """
+        self.show_message('3D Network Graph', 'Loading data...')
+
+    def show_message(self, title, text):
+        """Show a centred message in place of the plot"""
+        html = f"""
         <html>
         <head>
             <style>
-                body {
+                body {{
                     background: #1a1a2e;
                     color: #FFD700;
                     font-family: Arial;
@@ -49,16 +98,16 @@ class NetworkView(QWidget):
                     align-items: center;
                     height: 100vh;
                     margin: 0;
-                }
-                .message {
+                }}
+                .message {{
                     text-align: center;
-                }
+                }}
             </style>
         </head>
         <body>
             <div class="message">
-                <h1>3D Network Graph</h1>
-                <p>Loading data...</p>
+                <h1>{title}</h1>
+                <p>{text}</p>
             </div>
         </body>
         </html>
@@ -68,20 +117,21 @@ class NetworkView(QWidget):
     def set_data(self, data):
         """Set data and build graph"""
         self.data = data
+        self.metrics = chapter_metrics(data)
+        self.positions = chapter_positions(data, dim=3)
         self.build_graph()
         self.render()
 
     def build_graph(self):
         """Build NetworkX graph from data"""
         self.graph = nx.Graph()
+        self.layout_cache.clear()
 
-        # PERFORMANCE: Limit to top 500 connections to prevent freezing
-        # Full dataset has 190K+ connections which is too slow for 3D layout
-        connections = sorted(
-            self.data['connections'],
-            key=lambda x: x['weight'],
-            reverse=True
-        )[:500]  # Top 500 most-connected chapters
+        # PERFORMANCE: Limit to the top connections to prevent freezing.
+        # With precomputed positions (graph_layout.bin) only drawing costs,
+        # so more edges fit; otherwise the 3D spring layout is the bottleneck
+        limit = 2000 if self.positions is not None else 500
+        connections = top_connections(self.data, limit)
 
         # Get unique chapter IDs from top connections
         chapter_ids = set()
@@ -112,13 +162,10 @@ class NetworkView(QWidget):
         if not self.graph:
             return
 
-        # Apply filters if provided
-        graph = self.graph.copy()
-        if filters:
-            graph = self.filter_graph(graph, filters)
+        # Apply filters if provided (filter_graph works on its own copy)
+        graph = self.filter_graph(self.graph, filters) if filters else self.graph
 
-        # Calculate 3D spring layout
-        pos = nx.spring_layout(graph, dim=3, k=0.5, iterations=50)
+        pos = self.layout_for(graph)
 
         # Extract coordinates
         node_x = []
@@ -126,6 +173,13 @@ class NetworkView(QWidget):
         node_z = []
         node_text = []
         node_colors = []
+        node_sizes = []
+
+        # Precomputed metrics size nodes by PageRank and colour them by community
+        metrics = self.metrics
+        has_communities = metrics is not None and 'community' in metrics
+        if metrics is not None:
+            max_rank = float(metrics['pagerank'].max()) or 1.0
 
         for node in graph.nodes():
             x, y, z = pos[node]
@@ -139,25 +193,29 @@ class NetworkView(QWidget):
             chapter = node_data['chapter_num']
             testament = node_data['testament']
 
-            node_text.append(f"{book} {chapter}<br>Testament: {testament}<br>Connections: {graph.degree(node)}")
-
-            # Color by testament
-            if testament == 'OT':
+            text = f"{book} {chapter}<br>Testament: {testament}<br>Connections: {graph.degree(node)}"
+            if metrics is not None:
+                rank = float(metrics['pagerank'][node])
+                text += f"<br>PageRank: {rank:.5f}"
+                node_sizes.append(3 + 9 * np.sqrt(rank / max_rank))
+            if has_communities:
+                community = int(metrics['community'][node])
+                text += f"<br>Community: {community + 1}"
+                node_colors.append(COMMUNITY_COLORS[community % len(COMMUNITY_COLORS)])
+            elif testament == 'OT':
+                # Color by testament
                 node_colors.append('#2ecc71')
             else:
                 node_colors.append('#00CED1')
+            node_text.append(text)
 
-        # Create edges
-        edge_x = []
-        edge_y = []
-        edge_z = []
-
-        for edge in graph.edges():
-            x0, y0, z0 = pos[edge[0]]
-            x1, y1, z1 = pos[edge[1]]
-            edge_x.extend([x0, x1, None])
-            edge_y.extend([y0, y1, None])
-            edge_z.extend([z0, z1, None])
+        # Create edges: (start, end, NaN gap) per edge, as arrays, since
+        # plotly validates plain lists element by element
+        edges = list(graph.edges())
+        edge_xyz = np.full((len(edges), 3, 3), np.nan)
+        edge_xyz[:, 0] = [pos[u] for u, _ in edges]
+        edge_xyz[:, 1] = [pos[v] for _, v in edges]
+        edge_x, edge_y, edge_z = (edge_xyz[:, :, axis].ravel() for axis in range(3))
 
         # Create edge trace
         edge_trace = go.Scatter3d(
@@ -170,10 +228,10 @@ class NetworkView(QWidget):
 
         # Create node trace
         node_trace = go.Scatter3d(
-            x=node_x, y=node_y, z=node_z,
+            x=np.array(node_x), y=np.array(node_y), z=np.array(node_z),
             mode='markers',
             marker=dict(
-                size=5,
+                size=node_sizes or 5,
                 color=node_colors,
                 line=dict(color='#FFD700', width=0.5),
                 opacity=0.8
@@ -202,16 +260,62 @@ class NetworkView(QWidget):
             plot_bgcolor='#1a1a2e',
             font=dict(color='#00CED1'),
             hovermode='closest',
-            margin=dict(l=0, r=0, t=40, b=0)
+            margin=dict(l=0, r=0, t=40, b=0),
+            uirevision='network'  # keep the camera when filters swap the data
         )
 
-        # Save to temp file and load
-        # IMPORTANT: include_plotlyjs=True embeds full Plotly.js library (no CDN needed)
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8')
-        fig.write_html(temp_file.name, include_plotlyjs=True)
-        temp_file.close()
+        self.figure = fig
+        self.push_figure(fig.to_json())
 
-        self.web_view.setUrl(QUrl.fromLocalFile(temp_file.name))
+    def layout_for(self, graph):
+        """Node positions: precomputed, or a cached 3D spring layout
+
+        Filters only remove nodes, so a filtered graph is the subgraph
+        induced by its node set, and the node set alone keys the cache.
+        """
+        if self.positions is not None:
+            return {node: self.positions[node] for node in graph.nodes()}
+
+        key = frozenset(graph.nodes())
+        pos = self.layout_cache.get(key)
+        if pos is None:
+            # Seeded, so a node set always gets the same layout
+            pos = nx.spring_layout(graph, dim=3, k=0.5, iterations=50, seed=0)
+            self.layout_cache[key] = pos
+            if len(self.layout_cache) > LAYOUT_CACHE_SIZE:
+                self.layout_cache.popitem(last=False)
+        else:
+            self.layout_cache.move_to_end(key)
+        return pos
+
+    def push_figure(self, figure_json):
+        """Show a figure (plotly JSON) in the network page, loading it first if needed"""
+        if self.page_ready:
+            self.web_view.page().runJavaScript(f'updateNetwork({figure_json});')
+            return
+
+        # Only the latest figure matters once the page is up
+        self.pending_figure = figure_json
+        if not self.page_loading:
+            self.page_loading = True
+            self.web_view.loadFinished.connect(self.on_page_loaded)
+            self.web_view.setHtml(NETWORK_PAGE, QUrl.fromLocalFile(str(PLOTLY_JS_DIR) + '/'))
+
+    def on_page_loaded(self, ok):
+        """Network page is up: plotly.js is loaded, draw the pending figure"""
+        self.web_view.loadFinished.disconnect(self.on_page_loaded)
+        self.page_loading = False
+        if not ok:
+            # Drop the figure; the next push_figure loads the page again
+            self.pending_figure = None
+            print(f"Error loading network page from {PLOTLY_JS_DIR}")
+            self.show_message('3D Network Graph',
+                              'Could not load the plot page. It is retried on the next update.')
+            return
+        self.page_ready = True
+        figure_json, self.pending_figure = self.pending_figure, None
+        if figure_json is not None:
+            self.push_figure(figure_json)
 
     def filter_graph(self, graph, filters):
         """Apply filters to graph"""
@@ -257,7 +361,7 @@ class NetworkView(QWidget):
 
     def export(self):
         """Export current view"""
-        if not self.graph:
+        if self.figure is None:
             return
 
         # Export as HTML
@@ -270,12 +374,5 @@ class NetworkView(QWidget):
         )
 
         if filename:
-            # Re-render and save
-            pos = nx.spring_layout(self.graph, dim=3, k=0.5, iterations=50)
-
-            # Create figure (same as render method)
-            # ... (code similar to render method)
-
-            # Save
-            # fig.write_html(filename)
-            pass
+            # A standalone file, so plotly.js is embedded here
+            self.figure.write_html(filename, include_plotlyjs=True)
@@ -0,0 +1,215 @@
+"""
+Binary Graph Data Loader
+Memory-maps processed/graph_data.bin written by data_processor.py
+"""
+
+import os
+import sys
+from collections.abc import Sequence
+
+import numpy as np
+
+# The bundle format lives with the processor in shared-data (graph_binary.py);
+# check the desktop layout (../shared-data) and this repository's (../WEB APP/shared-data)
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+for _shared_data in (os.path.join(_APP_DIR, '..', 'shared-data'),
+                     os.path.join(_APP_DIR, '..', 'WEB APP', 'shared-data')):
+    if os.path.exists(os.path.join(_shared_data, 'graph_binary.py')):
+        sys.path.insert(0, _shared_data)
+        break
+
+from graph_binary import open_bundle
+
+# Written next to graph_data.bin by the processor's export-metrics and
+# export-layout stages
+METRICS_FILE = 'graph_metrics.bin'
+LAYOUT_FILE = 'graph_layout.bin'
+
+
+class EdgeList(Sequence):
+    """Read-only list of connection dicts backed by the edge arrays
+
+    Dicts are created only for the items actually accessed, so views
+    that still iterate 'connections' keep working unchanged.
+    """
+
+    def __init__(self, source, target, weight):
+        self.source = source
+        self.target = target
+        self.weight = weight
+
+    def __len__(self):
+        return len(self.source)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {
+            'source': int(self.source[index]),
+            'target': int(self.target[index]),
+            'weight': int(self.weight[index])
+        }
+
+    def __iter__(self):
+        for source, target, weight in zip(self.source.tolist(),
+                                          self.target.tolist(),
+                                          self.weight.tolist()):
+            yield {'source': source, 'target': target, 'weight': weight}
+
+
+class GraphStore:
+    """Zero-copy access to the binary chapter graph"""
+
+    def __init__(self, path):
+        self.path = path
+        self.arrays = {}
+        self.metadata = {}
+        self._chapters = None
+        self._metrics = None
+        self._layout = None
+
+    @classmethod
+    def open(cls, path):
+        """Memory-map a graph bundle"""
+        store = cls(path)
+        store.arrays, store.metadata = open_bundle(path)
+        return store
+
+    @property
+    def metrics(self):
+        """Per-chapter metric arrays from graph_metrics.bin (None if not generated)
+
+        Keys: out_strength, in_strength, out_degree, in_degree, pagerank,
+        betweenness and, when communities were computed, community.
+        """
+        if self._metrics is None:
+            path = os.path.join(os.path.dirname(self.path), METRICS_FILE)
+            if not os.path.exists(path):
+                return None
+            self._metrics = open_bundle(path)[0]
+        return self._metrics
+
+    @property
+    def layout(self):
+        """position_2d / position_3d arrays from graph_layout.bin (None if not generated)"""
+        if self._layout is None:
+            path = os.path.join(os.path.dirname(self.path), LAYOUT_FILE)
+            if not os.path.exists(path):
+                return None
+            self._layout = open_bundle(path)[0]
+        return self._layout
+
+    @property
+    def books(self):
+        return self.metadata['books']
+
+    @property
+    def edge_source(self):
+        return self.arrays['edge_source']
+
+    @property
+    def edge_target(self):
+        return self.arrays['edge_target']
+
+    @property
+    def edge_weight(self):
+        return self.arrays['edge_weight']
+
+    @property
+    def book_matrix(self):
+        return self.arrays['book_matrix']
+
+    def outgoing(self, chapter_id):
+        """(targets, weights) of the edges leaving a chapter, as array slices"""
+        start, end = self.arrays['out_indptr'][chapter_id:chapter_id + 2]
+        return self.edge_target[start:end], self.edge_weight[start:end]
+
+    def incoming(self, chapter_id):
+        """(sources, weights) of the edges entering a chapter"""
+        start, end = self.arrays['in_indptr'][chapter_id:chapter_id + 2]
+        edges = self.arrays['in_edges'][start:end]
+        return self.edge_source[edges], self.edge_weight[edges]
+
+    @property
+    def weight_order(self):
+        """Edge ids by weight descending (None for bundles written before rankings)"""
+        return self.arrays.get('weight_order')
+
+    def top_chapter_edge_ids(self, chapter_id):
+        """Ids of the heaviest edges touching a chapter, at most metadata['top_k']"""
+        start, end = self.arrays['top_indptr'][chapter_id:chapter_id + 2]
+        return self.arrays['top_edges'][start:end]
+
+    def book_pair_edge_ids(self, source_book, target_book):
+        """Ids of the edges from one book to another (indices 0-65), heaviest first
+
+        None for bundles written before the book-pair index.
+        """
+        if 'book_pair_offsets' not in self.arrays:
+            return None
+        bucket = source_book * len(self.books) + target_book
+        start, end = self.arrays['book_pair_offsets'][bucket:bucket + 2]
+        return self.arrays['book_pair_order'][start:end]
+
+    def chapter_edge_ids(self, chapter_id):
+        """Edge indices touching a chapter in either direction"""
+        start, end = self.arrays['out_indptr'][chapter_id:chapter_id + 2]
+        in_start, in_end = self.arrays['in_indptr'][chapter_id:chapter_id + 2]
+        return np.concatenate((np.arange(start, end), self.arrays['in_edges'][in_start:in_end]))
+
+    @property
+    def chapters(self):
+        """Chapter node dicts in the same shape as graph_data.json"""
+        if self._chapters is None:
+            books = self.books
+            self._chapters = [
+                {
+                    'id': i,
+                    'label': f"{books[b]['name']} {n}",
+                    'book': books[b]['name'],
+                    'chapter': n,
+                    'book_index': b,
+                    'testament': books[b]['testament']
+                }
+                for i, (b, n) in enumerate(zip(self.arrays['chapter_book_index'].tolist(),
+                                               self.arrays['chapter_number'].tolist()))
+            ]
+        return self._chapters
+
+    def to_graph_data(self):
+        """Dict with the graph_data.json keys, backed by the mapped arrays"""
+        return {
+            'metadata': {key: self.metadata[key] for key in
+                         ('total_books', 'total_chapters', 'total_connections', 'total_verse_refs')},
+            'books': self.books,
+            'chapters': self.chapters,
+            'connections': EdgeList(self.edge_source, self.edge_target, self.edge_weight),
+            'book_matrix': self.book_matrix,
+            'store': self
+        }
+
+
+def chapter_metrics(data):
+    """Per-chapter metric arrays for graph data, or None if unavailable"""
+    store = data.get('store')
+    return store.metrics if store is not None else None
+
+
+def chapter_positions(data, dim=3):
+    """(chapters, dim) precomputed positions for graph data, or None if unavailable"""
+    store = data.get('store')
+    layout = store.layout if store is not None else None
+    return layout[f'position_{dim}d'] if layout is not None else None
+
+
+def top_connections(data, limit):
+    """The limit heaviest connections of graph data, heaviest first
+
+    Slices the precomputed weight ranking when the data came from a
+    GraphStore; plain JSON data falls back to a stable sort.
+    """
+    store = data.get('store')
+    if store is not None and store.weight_order is not None:
+        connections = data['connections']
+        return [connections[i] for i in store.weight_order[:limit].tolist()]
+    return sorted(data['connections'], key=lambda x: x['weight'], reverse=True)[:limit]
@@ -0,0 +1,83 @@
+"""
+Test that full density mode draws every pixel an arc passes through
+
+rasterize_arcs is compared with a brute-force reference that samples each
+arc far more densely than the pixel grid, over the full view and zoomed-in
+windows (where the steep feet of long arcs are cut off by the y range).
+The GUI thread rasterizes in steps between timer ticks, so no single step
+may take longer than a tick's budget.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from components.arc_view import (DENSITY_CHUNK, DENSITY_TICK_MS, arc_segments,
+                                  iter_rasterize_arcs, rasterize_arcs)
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SHAPE = (400, 900)
+WINDOWS = {
+    'full view': ((-5, 1194), (-15, 120)),
+    'zoomed in': ((500, 560), (0, 12)),
+    'zoomed on apexes': ((300, 700), (60, 101)),
+}
+MIN_COVERAGE = 0.99
+
+
+def dense_pixels(x1, x2, xlim, ylim, shape):
+    """Pixels hit by each arc sampled at 8 points per pixel of its extent"""
+    rows, cols = shape
+    (left, right), (bottom, top) = xlim, ylim
+    px = cols / (right - left)
+    py = rows / (top - bottom)
+    hit = np.zeros(shape, dtype=bool)
+    for a, b in zip(x1, x2):
+        span = abs(b - a)
+        points = int(8 * (span * px + 4 * min(span * 0.4, 100) * py)) + 2
+        arc = arc_segments(np.array([a]), np.array([b]), points)[0]
+        col = np.floor((arc[:, 0] - left) * px).astype(np.int64)
+        row = np.floor((arc[:, 1] - bottom) * py).astype(np.int64)
+        inside = (row >= 0) & (row < rows) & (col >= 0) & (col < cols)
+        hit[row[inside], col[inside]] = True
+    return hit
+
+
+print("=" * 60)
+print("TESTING ARC DENSITY COVERAGE")
+print("=" * 60)
+
+rng = np.random.default_rng(0)
+x1 = rng.integers(0, 1189, 400)
+x2 = rng.integers(0, 1189, 400)
+weight = np.ones(len(x1))
+
+failed = False
+for name, (xlim, ylim) in WINDOWS.items():
+    expected = dense_pixels(x1, x2, xlim, ylim, SHAPE)
+    drawn = rasterize_arcs(x1, x2, weight, xlim, ylim, SHAPE) > 0
+    coverage = (drawn & expected).sum() / max(expected.sum(), 1)
+    ok = coverage >= MIN_COVERAGE
+    failed |= not ok
+    print(f"   {'✓' if ok else '✗'} {name}: {coverage:.2%} of {expected.sum()} arc pixels drawn")
+
+# A full chunk over the whole view on a large canvas is the worst case
+x1 = rng.integers(0, 1189, DENSITY_CHUNK)
+x2 = rng.integers(0, 1189, DENSITY_CHUNK)
+buffer = np.zeros((700, 1600))
+slowest = 0.0
+steps = iter_rasterize_arcs(x1, x2, np.ones(DENSITY_CHUNK), *WINDOWS['full view'], buffer)
+while True:
+    started = time.perf_counter()
+    if next(steps, StopIteration) is StopIteration:
+        break
+    slowest = max(slowest, time.perf_counter() - started)
+ok = slowest * 1000 <= DENSITY_TICK_MS
+failed |= not ok
+print(f"   {'✓' if ok else '✗'} slowest step: {slowest * 1000:.1f} ms (tick budget {DENSITY_TICK_MS} ms)")
+
+sys.exit(1 if failed else 0)
@@ -41,6 +41,22 @@ try:
 except Exception as e:
     print(f"   ✗ Error: {e}")
 
+# Test 1b: Memory-map binary graph data
+print("\n1b. Testing binary graph data loading...")
+try:
+    from graph_store import GraphStore
+
+    binary_path = Path(__file__).parent.parent / 'shared-data' / 'processed' / 'graph_data.bin'
+    print(f"   Binary data path: {binary_path}")
+    print(f"   Binary data exists: {binary_path.exists()}")
+
+    if binary_path.exists():
+        store = GraphStore.open(str(binary_path))
+        print(f"   ✓ Mapped binary data: {len(store.chapters)} chapters, {len(store.edge_source)} connections")
+
+except Exception as e:
+    print(f"   ✗ Error: {e}")
+
 # Test 2: Load theographic data
 print("\n2. Testing theographic data loading...")
 try:
@@ -5,11 +5,12 @@ Interactive 3D and 2D visualizations using PyQt5
 
 import sys
 import json
+import traceback
 from pathlib import Path
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QTabWidget, QLabel, QPushButton,
                              QComboBox, QSlider, QGroupBox, QStatusBar)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette, QColor
 
 # Import visualization components
@@ -17,6 +18,52 @@ from components.network_view import NetworkView
 from components.arc_view import ArcView
 from components.heatmap_view import HeatmapView
 from components.stats_view import StatsView
+from graph_store import GraphStore, chapter_metrics, chapter_positions
+
+
+class DataLoaderThread(QThread):
+    """Reads the graph data and statistics off the GUI thread
+
+    Only file I/O and parsing happen here; the views are populated on the
+    GUI thread from the signals.
+    """
+
+    progress = pyqtSignal(str)
+    graph_loaded = pyqtSignal(object)
+    stats_loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, processed_dir, parent=None):
+        super().__init__(parent)
+        self.processed_dir = Path(processed_dir)
+
+    def run(self):
+        try:
+            # Load graph data (memory-mapped binary if present, JSON otherwise)
+            binary_path = self.processed_dir / 'graph_data.bin'
+            data_path = self.processed_dir / 'graph_data.json'
+            stats_path = self.processed_dir / 'stats.json'
+
+            if binary_path.exists():
+                self.progress.emit(f'Opening {binary_path.name}...')
+                data = GraphStore.open(str(binary_path)).to_graph_data()
+                # Map the optional metrics/layout bundles here, not on first render
+                chapter_metrics(data)
+                chapter_positions(data)
+            else:
+                self.progress.emit(f'Parsing {data_path.name}...')
+                with open(data_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            self.graph_loaded.emit(data)
+
+            self.progress.emit(f'Loading {stats_path.name}...')
+            with open(stats_path, 'r', encoding='utf-8') as f:
+                self.stats_loaded.emit(json.load(f))
+
+        except FileNotFoundError:
+            self.failed.emit('Error: Data files not found. Run data_processor.py first.')
+        except Exception as e:
+            self.failed.emit(f'Error loading data: {str(e)}')
 
 
 class BibleVisualizerApp(QMainWindow):
@@ -26,6 +73,9 @@ class BibleVisualizerApp(QMainWindow):
         super().__init__()
         self.data = None
         self.stats = None
+        self.loader = None
+        self.pending_views = []
+        self.failed_views = []
         self.init_ui()
         self.load_data()
 
@@ -237,30 +287,63 @@ class BibleVisualizerApp(QMainWindow):
         self.setPalette(palette)
 
     def load_data(self):
-        """Load Bible cross-reference data"""
+        """Load Bible cross-reference data in the background
+
+        The window paints immediately; each view is populated on its own
+        event-loop turn once the data arrives, the visible tab first.
+        """
+        processed_dir = Path(__file__).parent.parent / 'shared-data' / 'processed'
+        self.status_bar.showMessage('Loading data...')
+
+        self.loader = DataLoaderThread(processed_dir, self)
+        self.loader.progress.connect(self.status_bar.showMessage)
+        self.loader.graph_loaded.connect(self.on_graph_loaded)
+        self.loader.stats_loaded.connect(self.on_stats_loaded)
+        self.loader.failed.connect(self.status_bar.showMessage)
+        self.loader.start()
+
+    def on_graph_loaded(self, data):
+        """Queue the graph views, current tab first"""
+        self.data = data
+        views = [self.network_view, self.arc_view, self.heatmap_view]
+        current = self.tabs.currentWidget()
+        self.pending_views = sorted(views, key=lambda view: view is not current)
+        self.failed_views = []
+        QTimer.singleShot(0, self.populate_next_view)
+
+    def populate_next_view(self):
+        """Hand the data to one view, then yield to the event loop"""
+        if not self.pending_views:
+            return
+
+        view = self.pending_views.pop(0)
+        name = self.tabs.tabText(self.tabs.indexOf(view))
+        self.status_bar.showMessage(f'Rendering {name}...')
         try:
-            # Load graph data
-            data_path = Path(__file__).parent.parent / 'shared-data' / 'processed' / 'graph_data.json'
-            stats_path = Path(__file__).parent.parent / 'shared-data' / 'processed' / 'stats.json'
-
-            with open(data_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-
-            with open(stats_path, 'r', encoding='utf-8') as f:
-                self.stats = json.load(f)
-
-            # Pass data to all views
-            self.network_view.set_data(self.data)
-            self.arc_view.set_data(self.data)
-            self.heatmap_view.set_data(self.data)
-            self.stats_view.set_data(self.stats)
-
-            self.status_bar.showMessage(f'Loaded {len(self.data["connections"])} connections from {len(self.data["chapters"])} chapters')
-
-        except FileNotFoundError:
-            self.status_bar.showMessage('Error: Data files not found. Run data_processor.py first.')
+            view.set_data(self.data)
         except Exception as e:
-            self.status_bar.showMessage(f'Error loading data: {str(e)}')
+            # One broken view must not leave the remaining ones empty
+            print(f"Error rendering {name}: {e}")
+            traceback.print_exc()
+            self.failed_views.append(name)
+
+        if self.pending_views:
+            QTimer.singleShot(0, self.populate_next_view)
+        else:
+            message = f'Loaded {len(self.data["connections"])} connections from {len(self.data["chapters"])} chapters'
+            if self.failed_views:
+                message += f' (error rendering {", ".join(self.failed_views)}, see console)'
+            self.status_bar.showMessage(message)
+
+    def on_stats_loaded(self, stats):
+        self.stats = stats
+        self.stats_view.set_data(self.stats)
+
+    def closeEvent(self, event):
+        """Let a running loader finish before its thread object is destroyed"""
+        if self.loader is not None and self.loader.isRunning():
+            self.loader.wait()
+        super().closeEvent(event)
 
     def apply_filters(self):
         """Apply current filter settings to all views"""
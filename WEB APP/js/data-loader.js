@@ -63,14 +63,23 @@ class BibleDataLoader {
                 console.log('🔧 LOCAL MODE: Loading from file...');
                 this.updateProgress(5, 'Loading local data...');
 
-                const response = await fetch(apiUrl);
-                if (!response.ok) {
-                    throw new Error(`HTTP error! status: ${response.status}`);
+                // Prefer the packed edge file, then the precompressed JSON sibling,
+                // both written by data_processor.py
+                let graphJson = await this.fetchPackedGraph('shared-data/processed/graph_edges.bin');
+                if (!graphJson) {
+                    graphJson = await this.fetchCompressedJson(apiUrl);
                 }
-
-                console.log('Graph response received, parsing JSON...');
-                this.updateProgress(60, 'Parsing JSON data...');
-                this.graphData = await response.json();
+                if (!graphJson) {
+                    const response = await fetch(apiUrl);
+                    if (!response.ok) {
+                        throw new Error(`HTTP error! status: ${response.status}`);
+                    }
+
+                    console.log('Graph response received, parsing JSON...');
+                    this.updateProgress(60, 'Parsing JSON data...');
+                    graphJson = await response.json();
+                }
+                this.graphData = this.normalizeGraphData(graphJson);
                 this.updateProgress(80, 'Processing graph data...');
 
                 // Load stats locally
@@ -109,7 +118,7 @@ class BibleDataLoader {
                 console.log('Parsing API response...');
                 this.updateProgress(60, 'Parsing filtered data...');
                 const parseStart = performance.now();
-                this.graphData = await response.json();
+                this.graphData = this.normalizeGraphData(await response.json());
                 const parseEnd = performance.now();
                 console.log(`⚡ JSON parsed in ${(parseEnd - parseStart).toFixed(0)}ms`);
                 this.updateProgress(80, 'Processing graph data...');
@@ -156,6 +165,157 @@ class BibleDataLoader {
         }
     }
 
+    /**
+     * Fetch url + '.gz' and decompress it in the browser.
+     * Returns null when the file or DecompressionStream is unavailable.
+     */
+    async fetchCompressedJson(url) {
+        if (typeof DecompressionStream === 'undefined') return null;
+
+        try {
+            const response = await fetch(`${url}.gz`);
+            if (!response.ok) return null;
+
+            console.log('Compressed graph received, decompressing...');
+            this.updateProgress(60, 'Decompressing data...');
+            const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+            return await new Response(stream).json();
+        } catch (error) {
+            console.warn('Compressed data unavailable, falling back to JSON:', error);
+            return null;
+        }
+    }
+
+    /**
+     * Fetch and decode the packed edge file (graph_edges.bin, or its .gz
+     * sibling when DecompressionStream is available).
+     * Returns null when neither file can be loaded.
+     */
+    async fetchPackedGraph(url) {
+        try {
+            let buffer = null;
+            if (typeof DecompressionStream !== 'undefined') {
+                try {
+                    const response = await fetch(`${url}.gz`);
+                    if (response.ok) {
+                        const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+                        buffer = await new Response(stream).arrayBuffer();
+                    }
+                } catch (error) {
+                    console.warn('Compressed packed edges unavailable, trying uncompressed:', error);
+                }
+            }
+            if (!buffer) {
+                const response = await fetch(url);
+                if (!response.ok) return null;
+                buffer = await response.arrayBuffer();
+            }
+
+            console.log('Packed graph received, decoding...');
+            this.updateProgress(60, 'Decoding packed edges...');
+            return this.decodePackedEdges(buffer);
+        } catch (error) {
+            console.warn('Packed edges unavailable, falling back to JSON:', error);
+            return null;
+        }
+    }
+
+    /**
+     * Decode the packed edge format (see shared-data/packed_edges.py):
+     *   bytes 0-7    magic "BXEDGES\0"
+     *   bytes 8-11   uint32 version (1), bytes 12-15 uint32 JSON header length
+     *   JSON header  {metadata, books, book_matrix, edges: {count, nodes,
+     *                keys_offset, weights_offset, weight_dtype, weight_scale}}
+     *   keys         unsigned LEB128 varints; the running sum of the deltas is
+     *                source * nodes + target
+     *   weights      uint8/uint16 at weights_offset; weight = value * weight_scale
+     * Returns graph data in the same shape as graph_data.json.
+     */
+    decodePackedEdges(buffer) {
+        const view = new DataView(buffer);
+        const bytes = new Uint8Array(buffer);
+        const magic = String.fromCharCode(...bytes.subarray(0, 8));
+        if (magic !== 'BXEDGES\0') throw new Error('Not a packed edge file');
+        const version = view.getUint32(8, true);
+        if (version !== 1) throw new Error(`Unsupported packed edge version ${version}`);
+
+        const headerLength = view.getUint32(12, true);
+        const header = JSON.parse(new TextDecoder().decode(bytes.subarray(16, 16 + headerLength)));
+        const { count, nodes, keys_offset, weights_offset, weight_dtype, weight_scale } = header.edges;
+
+        // Weights are little-endian; read through the DataView to stay byte-order safe
+        const wide = weight_dtype === 'uint16';
+        const connections = new Array(count);
+        let pos = keys_offset;
+        let key = 0;
+        for (let i = 0; i < count; i++) {
+            let delta = 0;
+            let factor = 1;
+            let byte;
+            do {
+                byte = bytes[pos++];
+                delta += (byte & 0x7F) * factor;
+                factor *= 128;
+            } while (byte >= 0x80);
+            key += delta;
+
+            const raw = wide ? view.getUint16(weights_offset + 2 * i, true) : bytes[weights_offset + i];
+            connections[i] = {
+                source: Math.floor(key / nodes),
+                target: key % nodes,
+                weight: weight_scale === 1 ? raw : Math.round(raw * weight_scale)
+            };
+        }
+
+        return {
+            metadata: header.metadata,
+            books: header.books,
+            chapters: this.chaptersFromBooks(header.books),
+            connections,
+            book_matrix: header.book_matrix
+        };
+    }
+
+    /**
+     * Chapter nodes in canonical order (a node's id is its chapter index),
+     * matching build_chapter_nodes() in data_processor.py.
+     */
+    chaptersFromBooks(books) {
+        const chapters = [];
+        books.forEach((book, bookIndex) => {
+            for (let ch = 1; ch <= book.chapters; ch++) {
+                chapters.push({
+                    id: chapters.length,
+                    label: `${book.name} ${ch}`,
+                    book: book.name,
+                    chapter: ch,
+                    book_index: bookIndex,
+                    testament: book.testament
+                });
+            }
+        });
+        return chapters;
+    }
+
+    /**
+     * Expand columnar connections (parallel source/target/weight arrays)
+     * into the connection objects the visualizations expect.
+     */
+    normalizeGraphData(data) {
+        const columns = data.connection_columns;
+        if (!columns || data.connections) return data;
+
+        const { source, target, weight } = columns;
+        const connections = new Array(source.length);
+        for (let i = 0; i < source.length; i++) {
+            connections[i] = { source: source[i], target: target[i], weight: weight[i] };
+        }
+
+        data.connections = connections;
+        delete data.connection_columns;
+        return data;
+    }
+
     getBooks() {
         return this.graphData ? this.graphData.books : [];
     }
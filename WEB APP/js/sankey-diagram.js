@@ -6,6 +6,7 @@ class SankeyDiagram {
         this.svgId = svgId;
         this.tooltipId = tooltipId;
         this.data = null;
+        this.bookRows = null;  // Row range per book when loaded from the section index
         this.currentBook = 'Genesis';
         this.bookAbbrevMap = {
             'Genesis': 'Gen',
@@ -34,6 +35,10 @@ class SankeyDiagram {
     async loadData() {
         if (this.data) return this.data;
 
+        // Precomputed index from data_processor.py; the raw TSV is the fallback
+        const indexed = await this.loadSectionIndex();
+        if (indexed) return indexed;
+
         try {
             const response = await fetch('data/bible-section-counts.txt');
             const text = await response.text();
@@ -58,6 +63,35 @@ class SankeyDiagram {
         }
     }
 
+    async loadSectionIndex() {
+        try {
+            const response = await fetch('shared-data/processed/section_index.json');
+            if (!response.ok) return null;
+            const index = await response.json();
+
+            // BBCCCVVV verse ids back to OSIS refs (Gen.1.1)
+            const abbrevs = index.books.map(b => b.abbrev);
+            const osis = id => `${abbrevs[Math.floor(id / 1000000) - 1]}.${Math.floor(id / 1000) % 1000}.${id % 1000}`;
+            const { start, end, next, count } = index.sections;
+
+            this.data = start.map((id, i) => ({
+                start: osis(id),
+                end: osis(end[i]),
+                next: osis(next[i]),
+                count: count[i]
+            }));
+            this.bookRows = {};
+            index.books.forEach((book, i) => {
+                this.bookRows[book.name] = [index.book_rows[i], index.book_rows[i + 1]];
+            });
+
+            console.log(`📊 Loaded ${this.data.length} section divisions from the section index`);
+            return this.data;
+        } catch (error) {
+            return null;
+        }
+    }
+
     async render(filters = {}) {
         const svg = d3.select(`#${this.svgId}`);
         svg.selectAll('*').remove();
@@ -74,7 +108,9 @@ class SankeyDiagram {
                           this.currentBook === 'Exodus' ? 'Exod.' :
                           this.bookAbbrevMap[this.currentBook] ? this.bookAbbrevMap[this.currentBook] + '.' : 'Gen.';
 
-        const bookData = this.data.filter(d => d.start.startsWith(bookPrefix));
+        const bookData = this.bookRows && this.bookRows[this.currentBook]
+            ? this.data.slice(...this.bookRows[this.currentBook])
+            : this.data.filter(d => d.start.startsWith(bookPrefix));
 
         if (bookData.length === 0) {
             this.showError(svg, `No data available for ${this.currentBook}`);
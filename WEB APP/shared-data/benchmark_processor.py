@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Data Processor Benchmark
+Times each BibleDataProcessor stage and records its peak traced memory,
+on the real cross_references.txt and on scaled synthetic copies
+
+Usage:
+    python benchmark_processor.py [--scales 2,10,50] [--streaming] [--workers N]
+                                  [--no-compress] [--no-memory] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from data_processor import BIBLE_BOOKS, BibleDataProcessor
+
+REAL_FILE = '../cross_references.txt'
+# Size of the OpenBible.info export, used when the real file is absent
+DEFAULT_BASE_REFS = 344799
+SYNTHETIC_HEADER = 'From Verse\tTo Verse\tVotes\t#synthetic benchmark data\n'
+GENERATE_CHUNK = 200000
+
+STAGES = [
+    'load_cross_references',
+    'aggregate_to_chapters',
+    'aggregate_to_books',
+    'export_for_web',
+    'export_stats'
+]
+
+
+def count_references(path):
+    """Data lines in a cross-reference file (header excluded)"""
+    with open(path, 'rb') as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+def generate_synthetic(path, total_refs, seed=0):
+    """Write a cross-reference file with random but well-formed references
+
+    Books are drawn in proportion to their chapter counts, and about one
+    reference in five is a range, so parsing and aggregation see the same
+    kind of input as the real data.
+    """
+    rng = np.random.default_rng(seed)
+    abbrevs = np.array([b['abbrev'] for b in BIBLE_BOOKS])
+    chapters = np.array([b['chapters'] for b in BIBLE_BOOKS])
+    book_p = chapters / chapters.sum()
+
+    def random_refs(n):
+        books = rng.choice(len(BIBLE_BOOKS), size=n, p=book_p)
+        chapter = (rng.random(n) * chapters[books]).astype(np.int64) + 1
+        verse = rng.integers(1, 31, size=n)
+        return abbrevs[books].tolist(), chapter.tolist(), verse.tolist()
+
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(SYNTHETIC_HEADER)
+        for start in range(0, total_refs, GENERATE_CHUNK):
+            n = min(GENERATE_CHUNK, total_refs - start)
+            from_book, from_ch, from_v = random_refs(n)
+            to_book, to_ch, to_v = random_refs(n)
+            span = np.where(rng.random(n) < 0.2, rng.integers(1, 6, size=n), 0).tolist()
+            votes = rng.integers(-5, 80, size=n).tolist()
+
+            lines = []
+            for i in range(n):
+                target = f"{to_book[i]}.{to_ch[i]}.{to_v[i]}"
+                if span[i]:
+                    target += f"-{to_book[i]}.{to_ch[i]}.{to_v[i] + span[i]}"
+                lines.append(f"{from_book[i]}.{from_ch[i]}.{from_v[i]}\t{target}\t{votes[i]}\n")
+            f.write(''.join(lines))
+
+
+def run_stages(input_file, output_dir, streaming=False, workers=None, compress=True, trace_memory=False):
+    """Run every stage once; returns {stage: {'seconds', 'peak_mb'}}
+
+    tracemalloc slows the parser several times over, so seconds from a
+    trace_memory=True run are not comparable with untraced timings.
+    """
+    processor = BibleDataProcessor(input_file, streaming=streaming, workers=workers)
+    actions = {
+        'load_cross_references': processor.load_cross_references,
+        'aggregate_to_chapters': processor.aggregate_to_chapters,
+        'aggregate_to_books': processor.aggregate_to_books,
+        'export_for_web': lambda: processor.export_for_web(
+            os.path.join(output_dir, 'graph_data.json'), compress=compress),
+        'export_stats': lambda: processor.export_stats(os.path.join(output_dir, 'stats.json'))
+    }
+
+    results = {}
+    for stage in STAGES:
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        actions[stage]()
+        seconds = time.perf_counter() - start
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+            tracemalloc.stop()
+
+        results[stage] = {'seconds': round(seconds, 4),
+                          'peak_mb': None if peak is None else round(peak, 2)}
+    return results
+
+
+def benchmark_input(input_file, output_dir, trace_memory=True, **options):
+    """Timed run, plus a second traced run for per-stage peak memory"""
+    results = run_stages(input_file, output_dir, **options)
+    if trace_memory:
+        traced = run_stages(input_file, output_dir, trace_memory=True, **options)
+        for stage in STAGES:
+            results[stage]['peak_mb'] = traced[stage]['peak_mb']
+
+    for stage in STAGES:
+        seconds, peak = results[stage]['seconds'], results[stage]['peak_mb']
+        print(f"  {stage:<24} {seconds:8.2f} s" + ('' if peak is None else f"  {peak:9.1f} MB peak"))
+
+    results['total'] = {
+        'seconds': round(sum(results[stage]['seconds'] for stage in STAGES), 4),
+        'peak_mb': max((results[stage]['peak_mb'] for stage in STAGES
+                        if results[stage]['peak_mb'] is not None), default=None)
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the cross-reference data processor')
+    parser.add_argument('--input', default=REAL_FILE,
+                        help='real cross-reference file (skipped if missing)')
+    parser.add_argument('--scales', default='2,10,50',
+                        help='comma-separated multiples of the real file size to synthesize')
+    parser.add_argument('--output', default='processed/benchmark_results.json',
+                        help='where to write the JSON results')
+    parser.add_argument('--streaming', action='store_true', help='use the streaming loader')
+    parser.add_argument('--workers', type=int, default=None, help='parse in N processes')
+    parser.add_argument('--no-compress', action='store_true',
+                        help='skip the .gz/.br siblings in export_for_web')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the second, memory-traced run of each input')
+    parser.add_argument('--seed', type=int, default=0, help='synthetic data seed')
+    parser.add_argument('--keep', action='store_true', help='keep the generated inputs')
+    args = parser.parse_args()
+
+    print("Bible Cross-Reference Processor Benchmark")
+    print("=" * 50)
+
+    work_dir = tempfile.mkdtemp(prefix='bible-bench-')
+    inputs = []
+    if os.path.exists(args.input):
+        base_refs = count_references(args.input)
+        inputs.append(('real', 1, args.input))
+    else:
+        base_refs = DEFAULT_BASE_REFS
+        print(f"[WARN] {args.input} not found, benchmarking synthetic inputs only")
+
+    for scale in [int(s) for s in args.scales.split(',') if s.strip()]:
+        path = os.path.join(work_dir, f'cross_references_x{scale}.txt')
+        print(f"Generating {scale}x synthetic input ({base_refs * scale:,} references)...")
+        generate_synthetic(path, base_refs * scale, seed=args.seed + scale)
+        inputs.append((f'synthetic_x{scale}', scale, path))
+
+    runs = []
+    try:
+        for name, scale, path in inputs:
+            print(f"\n[{name}] {path}")
+            output_dir = os.path.join(work_dir, name)
+            os.makedirs(output_dir, exist_ok=True)
+            stages = benchmark_input(path, output_dir, trace_memory=not args.no_memory,
+                                     streaming=args.streaming, workers=args.workers,
+                                     compress=not args.no_compress)
+            runs.append({
+                'input': name,
+                'scale': scale,
+                'references': count_references(path),
+                'file_mb': round(os.path.getsize(path) / 1024 / 1024, 2),
+                'stages': stages
+            })
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': {
+            'streaming': args.streaming,
+            'workers': args.workers,
+            'compress': not args.no_compress,
+            'trace_memory': not args.no_memory
+        },
+        'runs': runs
+    }
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\n[OK] Benchmark results written to {args.output}")
+    if args.keep:
+        print(f"  Generated inputs kept in {work_dir}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
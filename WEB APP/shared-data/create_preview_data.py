@@ -19,14 +19,19 @@ def create_preview_data():
 
     print(f"[OK] Loaded {len(full_data['connections'])} connections")
 
-    # Sort connections by weight (descending) and take top 200
-    sorted_connections = sorted(
-        full_data['connections'],
-        key=lambda x: x['weight'],
-        reverse=True
-    )
-
-    top_connections = sorted_connections[:200]
+    # Take top 200 by weight from the precomputed ranking, or sort if it is missing
+    rankings_path = os.path.join('processed', 'edge_rankings.json')
+    if os.path.exists(rankings_path):
+        with open(rankings_path, 'r', encoding='utf-8') as f:
+            weight_order = json.load(f)['weight_order']
+        top_connections = [full_data['connections'][i] for i in weight_order[:200]]
+    else:
+        sorted_connections = sorted(
+            full_data['connections'],
+            key=lambda x: x['weight'],
+            reverse=True
+        )
+        top_connections = sorted_connections[:200]
     print(f"[OK] Extracted top 200 connections (weight range: {top_connections[0]['weight']} - {top_connections[-1]['weight']})")
 
     # Get unique chapter indices used in top connections
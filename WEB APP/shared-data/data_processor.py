@@ -4,9 +4,38 @@ Bible Cross-Reference Data Processor
 Converts cross_references.txt into visualization-ready formats
 """
 
+import argparse
+import cProfile
+import gzip
+import hashlib
 import json
+import os
+import pstats
 import re
-from collections import defaultdict
+import sys
+import time
+import tracemalloc
+import zlib
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from graph_binary import write_bundle
+from graph_layout import LAYOUT_ITERATIONS, force_layout
+from packed_edges import write_packed_edges
+from sections import (DEFAULT_MIN_AGREEMENT, SECTION_FILE, SectionIndex, all_verse_ids,
+                      partition_sections)
+
+try:
+    import brotli  # Optional: enables .br siblings of the web exports
+except ImportError:
+    brotli = None
+
+try:
+    import graph_metrics  # Optional: needs SciPy (networkx for communities)
+except ImportError:
+    graph_metrics = None
 
 # Bible book metadata
 BIBLE_BOOKS = [
@@ -81,13 +110,635 @@ BIBLE_BOOKS = [
 # Create lookup dictionaries
 ABBREV_TO_BOOK = {b['abbrev']: b for b in BIBLE_BOOKS}
 BOOK_TO_INDEX = {b['name']: i for i, b in enumerate(BIBLE_BOOKS)}
+ABBREV_TO_INDEX = {b['abbrev']: i for i, b in enumerate(BIBLE_BOOKS)}
+
+# Integer index spaces used by the columnar store
+TOTAL_BOOKS = len(BIBLE_BOOKS)
+BOOK_CHAPTER_COUNTS = np.array([b['chapters'] for b in BIBLE_BOOKS], dtype=np.int32)
+BOOK_CHAPTER_OFFSETS = np.concatenate(([0], np.cumsum(BOOK_CHAPTER_COUNTS)[:-1])).astype(np.int32)
+TOTAL_CHAPTERS = int(BOOK_CHAPTER_COUNTS.sum())
+BOOK_IS_NT = np.array([b['testament'] == 'NT' for b in BIBLE_BOOKS], dtype=np.int8)
+
+# Compact verse-level record: book indices instead of nested dicts
+VerseRef = namedtuple('VerseRef', [
+    'from_book', 'from_chapter', 'from_verse',
+    'to_book', 'to_chapter', 'to_verse',
+    'votes'
+])
+
+# Chapter-level edge list (parallel arrays, sorted by source then target)
+ChapterEdges = namedtuple('ChapterEdges', ['source', 'target', 'weight'])
+# Positive and negative vote totals per edge (weight = positive + negative)
+EdgeVotes = namedtuple('EdgeVotes', ['positive', 'negative'])
+
+
+def make_verse_id(book_index, chapter, verse):
+    """Canonical BBCCCVVV verse id (book number is 1-based)"""
+    return (book_index + 1) * 1000000 + chapter * 1000 + verse
+
+
+def lookup_verse_refs(verse_index, verse_id, limit=None):
+    """Top cross-references of a verse from a verse index (built or memory-mapped)
+
+    Returns (target_verse_ids, votes) slices, most voted first.
+    """
+    verse_ids = verse_index['verse_ids']
+    row = np.searchsorted(verse_ids, verse_id)
+    if row >= len(verse_ids) or verse_ids[row] != verse_id:
+        return verse_index['target_ids'][:0], verse_index['votes'][:0]
+
+    start, end = verse_index['indptr'][row], verse_index['indptr'][row + 1]
+    if limit is not None:
+        end = min(end, start + limit)
+    return verse_index['target_ids'][start:end], verse_index['votes'][start:end]
+
+
+# Neighbors kept per chapter in the precomputed top-K lists
+TOP_K_NEIGHBORS = 50
+# Net-vote thresholds (positive - negative) with precomputed edge layers
+VOTE_THRESHOLDS = (0, 1, 5, 10, 25, 50, 100, 250)
+
+# Compact JSON for everything the browser downloads
+COMPACT_SEPARATORS = (',', ':')
+EDGE_WRITE_CHUNK = 8192
+
+# Levels for the .gz/.br siblings. The default is quick enough for every
+# run; release builds (--release) spend minutes on the smallest files
+Compression = namedtuple('Compression', ['gzip_level', 'brotli_quality'])
+FAST_COMPRESSION = Compression(gzip_level=6, brotli_quality=5)
+RELEASE_COMPRESSION = Compression(gzip_level=9, brotli_quality=11)
+
+
+def compression_levels(compress):
+    """Compression for a compress argument: False/None -> None, True -> FAST_COMPRESSION"""
+    if compress is True:
+        return FAST_COMPRESSION
+    return compress or None
+
+
+class CompressedTextWriter:
+    """Write text to a file and its .gz/.br siblings in a single pass
+
+    compress is False (plain file only), True (FAST_COMPRESSION) or a
+    Compression with explicit levels.
+    """
+
+    def __init__(self, output_file, compress=True):
+        self.output_file = output_file
+        self.raw = open(output_file, 'wb')
+        self.gzip = None
+        self.brotli = None
+        self.brotli_file = None
+
+        levels = compression_levels(compress)
+        if levels:
+            # mtime=0 keeps the .gz byte-identical across rebuilds
+            self.gzip = gzip.GzipFile(output_file + '.gz', 'wb', compresslevel=levels.gzip_level,
+                                      mtime=0)
+            if brotli is not None:
+                self.brotli = brotli.Compressor(mode=brotli.MODE_TEXT, quality=levels.brotli_quality)
+                self.brotli_file = open(output_file + '.br', 'wb')
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.raw.write(data)
+        if self.gzip:
+            self.gzip.write(data)
+        if self.brotli:
+            self.brotli_file.write(self.brotli.process(data))
+
+    def close(self):
+        self.raw.close()
+        if self.gzip:
+            self.gzip.close()
+        if self.brotli:
+            self.brotli_file.write(self.brotli.finish())
+            self.brotli_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def outputs(self):
+        """Paths written so far (plain file first)"""
+        paths = [self.output_file]
+        if self.gzip:
+            paths.append(self.output_file + '.gz')
+        if self.brotli:
+            paths.append(self.output_file + '.br')
+        return paths
+
+
+def aggregate_pairs(source, target, weight, total_nodes):
+    """Sum weights per (source, target) pair; edges sorted by source then target
+
+    A pair exists once any row links it, even when its weight sums to zero.
+    """
+    keys = source.astype(np.int64) * total_nodes + target
+    pairs, inverse = np.unique(keys, return_inverse=True)
+    sums = np.bincount(inverse, weights=weight, minlength=len(pairs)).astype(np.int64)
+    return ChapterEdges(
+        source=(pairs // total_nodes).astype(np.int32),
+        target=(pairs % total_nodes).astype(np.int32),
+        weight=sums
+    )
+
+
+def compact_json(value):
+    return json.dumps(value, separators=COMPACT_SEPARATORS)
+
+
+def compact_int_array(values):
+    """Store counts as int32 unless they outgrow it"""
+    values = np.asarray(values)
+    if values.size and values.max() > np.iinfo(np.int32).max:
+        return values.astype(np.int64)
+    return values.astype(np.int32)
+
+
+def build_chapter_nodes():
+    """Chapter node list in canonical order; a node's id is its chapter index"""
+    chapter_nodes = []
+    chapter_index = 0
+
+    for book in BIBLE_BOOKS:
+        for ch in range(1, book['chapters'] + 1):
+            chapter_nodes.append({
+                'id': chapter_index,
+                'label': f"{book['name']} {ch}",
+                'book': book['name'],
+                'chapter': ch,
+                'book_index': BOOK_TO_INDEX[book['name']],
+                'testament': book['testament']
+            })
+            chapter_index += 1
+
+    return chapter_nodes
+
+
+class VerseRefColumns:
+    """Integer-coded columnar store of verse-level cross-references
+
+    One int32 array per field. Chapter indices run 0..1188 in canonical
+    order (the chapter node ids of graph_data.json); references to a
+    chapter number the book does not have get chapter index -1.
+    """
+
+    FIELDS = ('from_verse_id', 'to_verse_id', 'from_chapter_idx', 'to_chapter_idx',
+              'from_book_idx', 'to_book_idx', 'votes')
+
+    def __init__(self, **columns):
+        for field in self.FIELDS:
+            setattr(self, field, np.asarray(columns[field], dtype=np.int32))
+
+    def __len__(self):
+        return len(self.votes)
+
+    @classmethod
+    def from_records(cls, records):
+        """Build columns from a list of VerseRef tuples"""
+        table = np.array(records, dtype=np.int32).reshape(-1, len(VerseRef._fields))
+        from_book, from_chapter, from_verse = table[:, 0], table[:, 1], table[:, 2]
+        to_book, to_chapter, to_verse = table[:, 3], table[:, 4], table[:, 5]
+
+        return cls(
+            from_verse_id=make_verse_id(from_book, from_chapter, from_verse),
+            to_verse_id=make_verse_id(to_book, to_chapter, to_verse),
+            from_chapter_idx=cls._chapter_index(from_book, from_chapter),
+            to_chapter_idx=cls._chapter_index(to_book, to_chapter),
+            from_book_idx=from_book,
+            to_book_idx=to_book,
+            votes=table[:, 6]
+        )
+
+    @classmethod
+    def concatenate(cls, chunks):
+        """Join several column chunks into one store"""
+        chunks = list(chunks)
+        if not chunks:
+            return cls.from_records([])
+        return cls(**{
+            field: np.concatenate([getattr(c, field) for c in chunks])
+            for field in cls.FIELDS
+        })
+
+    @staticmethod
+    def _chapter_index(book, chapter):
+        valid = (chapter >= 1) & (chapter <= BOOK_CHAPTER_COUNTS[book])
+        return np.where(valid, BOOK_CHAPTER_OFFSETS[book] + chapter - 1, -1)
+
+
+def pair_cells(chunk):
+    """Flattened chapter-pair and book-pair cells of a chunk
+
+    Chapter cells come with their signed votes (so positive and negative
+    totals can be kept apart), book cells with absolute votes.
+    Self-references, unknown chapters and same-book references are dropped
+    from the respective index space.
+    """
+    weight = np.abs(chunk.votes)
+
+    source, target = chunk.from_chapter_idx, chunk.to_chapter_idx
+    keep = (source != target) & (source >= 0) & (target >= 0)
+    chapter_flat = source[keep].astype(np.int64) * TOTAL_CHAPTERS + target[keep]
+    chapter_votes = chunk.votes[keep].astype(np.int64)
+
+    keep = chunk.from_book_idx != chunk.to_book_idx
+    book_flat = chunk.from_book_idx[keep].astype(np.int64) * TOTAL_BOOKS + chunk.to_book_idx[keep]
+    book_weight = weight[keep]
+
+    return chapter_flat, chapter_votes, book_flat, book_weight
+
+
+def split_votes(votes):
+    """(positive, negative) vote magnitudes; their sum is abs(votes)"""
+    return np.maximum(votes, 0), np.maximum(-votes, 0)
+
+
+def book_totals(chunk):
+    """Per-book outgoing/incoming reference counts and testament-pair counts"""
+    testament_pair = BOOK_IS_NT[chunk.from_book_idx] * 2 + BOOK_IS_NT[chunk.to_book_idx]
+    return {
+        'book_out': np.bincount(chunk.from_book_idx, minlength=TOTAL_BOOKS).astype(np.int64),
+        'book_in': np.bincount(chunk.to_book_idx, minlength=TOTAL_BOOKS).astype(np.int64),
+        'testament': np.bincount(testament_pair, minlength=4).astype(np.int64)
+    }
+
+
+def count_chunk(chunk):
+    """Partial count arrays for one column chunk
+
+    Every entry is additive, so summing the partials of all chunks (or
+    shards) gives the totals for the whole file.
+    """
+    chapter_cells = TOTAL_CHAPTERS * TOTAL_CHAPTERS
+    book_cells = TOTAL_BOOKS * TOTAL_BOOKS
+    chapter_flat, chapter_votes, book_flat, book_weight = pair_cells(chunk)
+    positive, negative = split_votes(chapter_votes)
+
+    counts = {
+        'rows': len(chunk),
+        'chapter_weights': np.bincount(chapter_flat, weights=positive + negative,
+                                       minlength=chapter_cells).astype(np.int64),
+        'chapter_positive': np.bincount(chapter_flat, weights=positive,
+                                        minlength=chapter_cells).astype(np.int64),
+        'chapter_negative': np.bincount(chapter_flat, weights=negative,
+                                        minlength=chapter_cells).astype(np.int64),
+        'chapter_refs': np.bincount(chapter_flat, minlength=chapter_cells).astype(np.int64),
+        'book_weights': np.bincount(book_flat, weights=book_weight,
+                                    minlength=book_cells).astype(np.int64)
+    }
+    counts.update(book_totals(chunk))
+    return counts
+
+
+def merge_counts(total, partial):
+    """Add one set of partial counts into a running total"""
+    if total is None:
+        return partial
+    for key, value in partial.items():
+        total[key] = total[key] + value
+    return total
+
+
+def find_shard_ranges(path, shards):
+    """Split a file into byte ranges that start on line boundaries
+
+    The header line is excluded. Every range ends where the next begins,
+    so each row belongs to exactly one shard.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.readline()  # Skip header
+        data_start = f.tell()
+
+        bounds = [data_start]
+        for i in range(1, shards):
+            offset = data_start + (size - data_start) * i // shards
+            if offset <= bounds[-1]:
+                continue
+            # Move to the start of the line after offset - 1
+            f.seek(offset - 1)
+            f.readline()
+            if f.tell() < size:
+                bounds.append(f.tell())
+        bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+# Bytes of input per shard in the process pool: small enough to balance
+# the workers, large enough that a shard's partials stay cheap to pickle
+SHARD_BYTES = 2 * 1024 * 1024
+
+
+def shard_count(path):
+    """Number of shards for a file, from its size alone"""
+    return max(1, -(-os.path.getsize(path) // SHARD_BYTES))
+
+
+def _count_shard(args):
+    """Worker entry point: parse one byte range and return its sparse partial counts
+
+    Only the cells the shard occupies go back to the parent (see
+    sparse_count_chunk), not five dense 1189 x 1189 arrays.
+    """
+    cross_ref_file, start, end, chunk_size = args
+    processor = BibleDataProcessor(cross_ref_file, chunk_size=chunk_size)
+    return sparse_count_chunk(VerseRefColumns.concatenate(processor.iter_column_chunks(start, end)))
+
+
+# Incremental rebuilds split the file into content-defined chunks: a chunk
+# ends after any line whose CRC matches the boundary mask, so an edit only
+# changes the hash of the chunk it falls in, not of every chunk after it.
+INCREMENTAL_CACHE_VERSION = 3
+CHUNK_BOUNDARY_MASK = 0xFF   # ~256 rows per chunk on average
+CHUNK_MAX_LINES = 4096
+
+# Count arrays stored sparsely per chunk, mapped to their cell index array
+SPARSE_COUNT_KEYS = {
+    'chapter_weights': 'chapter_cells',
+    'chapter_positive': 'chapter_cells',
+    'chapter_negative': 'chapter_cells',
+    'chapter_refs': 'chapter_cells',
+    'book_weights': 'book_cells'
+}
+DENSE_COUNT_KEYS = ('book_out', 'book_in', 'testament')
+
+
+def iter_content_chunks(path):
+    """Yield (digest, start, end) byte ranges of content-defined chunks"""
+    with open(path, 'rb') as f:
+        f.readline()  # Skip header
+        start = position = f.tell()
+        digest = hashlib.sha1()
+        lines = 0
+
+        for raw_line in f:
+            position += len(raw_line)
+            digest.update(raw_line)
+            lines += 1
+            if (zlib.crc32(raw_line) & CHUNK_BOUNDARY_MASK) == 0 or lines >= CHUNK_MAX_LINES:
+                yield digest.hexdigest(), start, position
+                start = position
+                digest = hashlib.sha1()
+                lines = 0
+
+        if lines:
+            yield digest.hexdigest(), start, position
+
+
+def sparse_count_chunk(chunk):
+    """Like count_chunk(), but only for the cells the chunk occupies"""
+    chapter_flat, chapter_votes, book_flat, book_weight = pair_cells(chunk)
+    positive, negative = split_votes(chapter_votes)
+    chapter_cells, chapter_inverse = np.unique(chapter_flat, return_inverse=True)
+    book_cells, book_inverse = np.unique(book_flat, return_inverse=True)
+
+    sparse = {
+        'rows': len(chunk),
+        'chapter_cells': chapter_cells,
+        'chapter_weights': np.bincount(chapter_inverse, weights=positive + negative,
+                                       minlength=len(chapter_cells)).astype(np.int64),
+        'chapter_positive': np.bincount(chapter_inverse, weights=positive,
+                                        minlength=len(chapter_cells)).astype(np.int64),
+        'chapter_negative': np.bincount(chapter_inverse, weights=negative,
+                                        minlength=len(chapter_cells)).astype(np.int64),
+        'chapter_refs': np.bincount(chapter_inverse, minlength=len(chapter_cells)).astype(np.int64),
+        'book_cells': book_cells,
+        'book_weights': np.bincount(book_inverse, weights=book_weight,
+                                    minlength=len(book_cells)).astype(np.int64)
+    }
+    sparse.update(book_totals(chunk))
+    return sparse
+
+
+def apply_sparse_counts(totals, sparse, sign):
+    """Add (sign=1) or subtract (sign=-1) one chunk's sparse counts in place"""
+    totals['rows'] += sign * int(sparse['rows'])
+    for key, cells_key in SPARSE_COUNT_KEYS.items():
+        totals[key][sparse[cells_key]] += sign * sparse[key]
+    for key in DENSE_COUNT_KEYS:
+        totals[key] += sign * sparse[key]
+
+
+def sparse_totals(totals):
+    """Dense totals in sparse_count_chunk() form, for caching
+
+    A chapter cell is stored when a reference counts in it (chapter_refs
+    > 0); all other chapter counts are zero elsewhere. Most of the
+    1189 x 1189 cells are empty, so this is a fraction of the dense size.
+    """
+    sparse = {
+        'rows': np.array(totals['rows']),
+        'chapter_cells': np.flatnonzero(totals['chapter_refs']).astype(np.int32),
+        'book_cells': np.flatnonzero(totals['book_weights']).astype(np.int32)
+    }
+    for key, cells_key in SPARSE_COUNT_KEYS.items():
+        sparse[key] = totals[key][sparse[cells_key]]
+    for key in DENSE_COUNT_KEYS:
+        sparse[key] = totals[key]
+    return sparse
+
+
+def dense_totals(sparse):
+    """Inverse of sparse_totals()"""
+    totals = count_chunk(VerseRefColumns.from_records([]))
+    apply_sparse_counts(totals, sparse, 1)
+    return totals
+
+
+def load_incremental_cache(cache_file):
+    """Read the chunk partials of a previous run, or None if unusable"""
+    if not os.path.exists(cache_file):
+        return None
+
+    with np.load(cache_file) as npz:
+        # Read each array once; NpzFile re-reads on every key access
+        cache = {key: npz[key] for key in npz.files}
+
+    if int(cache['version']) != INCREMENTAL_CACHE_VERSION:
+        return None
+
+    hashes = [h.decode('ascii') for h in cache['hashes']]
+    chapter_offsets = cache['chapter_offsets']
+    book_offsets = cache['book_offsets']
+
+    chunks = {}
+    for i, digest in enumerate(hashes):
+        if digest in chunks:
+            continue
+        c0, c1 = chapter_offsets[i], chapter_offsets[i + 1]
+        b0, b1 = book_offsets[i], book_offsets[i + 1]
+        chunks[digest] = {
+            'rows': int(cache['rows'][i]),
+            'chapter_cells': cache['chapter_cells'][c0:c1],
+            'chapter_weights': cache['chapter_weights'][c0:c1],
+            'chapter_positive': cache['chapter_positive'][c0:c1],
+            'chapter_negative': cache['chapter_negative'][c0:c1],
+            'chapter_refs': cache['chapter_refs'][c0:c1],
+            'book_cells': cache['book_cells'][b0:b1],
+            'book_weights': cache['book_weights'][b0:b1],
+            'book_out': cache['book_out'][i],
+            'book_in': cache['book_in'][i],
+            'testament': cache['testament'][i]
+        }
+
+    totals = dense_totals({key[len('total_'):]: value for key, value in cache.items()
+                           if key.startswith('total_')})
+    return {'hashes': hashes, 'chunks': chunks, 'totals': totals, 'input': str(cache['input'])}
+
+
+def save_incremental_cache(cache_file, hashes, chunks, totals, fingerprint):
+    """Write chunk partials (in file order), the reduced totals and the input's fingerprint"""
+    ordered = [chunks[digest] for digest in hashes]
+
+    def offsets(key):
+        return np.concatenate(([0], np.cumsum([len(c[key]) for c in ordered]))).astype(np.int64)
+
+    def joined(key, dtype=np.int64):
+        if not ordered:
+            return np.zeros(0, dtype=dtype)
+        return np.concatenate([c[key] for c in ordered]).astype(dtype)
+
+    def stacked(key, width):
+        if not ordered:
+            return np.zeros((0, width), dtype=np.int64)
+        return np.stack([c[key] for c in ordered])
+
+    arrays = {
+        'version': np.array(INCREMENTAL_CACHE_VERSION),
+        'input': np.array(fingerprint or ''),
+        'hashes': np.array([h.encode('ascii') for h in hashes], dtype='S40'),
+        'rows': np.array([c['rows'] for c in ordered], dtype=np.int64),
+        'chapter_offsets': offsets('chapter_cells'),
+        'chapter_cells': joined('chapter_cells', np.int32),
+        'chapter_weights': joined('chapter_weights'),
+        'chapter_positive': joined('chapter_positive'),
+        'chapter_negative': joined('chapter_negative'),
+        'chapter_refs': joined('chapter_refs'),
+        'book_offsets': offsets('book_cells'),
+        'book_cells': joined('book_cells', np.int32),
+        'book_weights': joined('book_weights'),
+        'book_out': stacked('book_out', TOTAL_BOOKS),
+        'book_in': stacked('book_in', TOTAL_BOOKS),
+        'testament': stacked('testament', 4)
+    }
+    for key, value in sparse_totals(totals).items():
+        arrays['total_' + key] = value
+
+    os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+    # Write under a temporary name so an interrupted run keeps the old cache.
+    # Uncompressed: zlib over these arrays costs more than re-parsing the file
+    temp_file = cache_file + '.tmp.npz'
+    np.savez(temp_file, **arrays)
+    os.replace(temp_file, cache_file)
+
+
+# Intermediates kept between stage-only runs of the CLI
+STAGE_CACHE_VERSION = 3
+PIPELINE_STAGES = ['parse', 'aggregate', 'export-web', 'export-stats', 'export-binary',
+                   'export-sections', 'export-lod', 'export-metrics', 'export-layout']
+
+
+def source_stamp(path):
+    """(size, mtime_ns) of the input file, or zeros when it is absent"""
+    if not os.path.exists(path):
+        return np.zeros(2, dtype=np.int64)
+    info = os.stat(path)
+    return np.array([info.st_size, info.st_mtime_ns], dtype=np.int64)
+
+
+def save_stage_cache(cache_file, source_file, arrays):
+    """Write a stage's arrays plus the stamp of the file they came from
+
+    Uncompressed, since these are local intermediates and speed matters
+    more than a few MB on disk.
+    """
+    os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+    temp_file = cache_file + '.tmp.npz'
+    np.savez(temp_file, version=np.array(STAGE_CACHE_VERSION),
+             source=source_stamp(source_file), **arrays)
+    os.replace(temp_file, cache_file)
+
+
+def load_stage_cache(cache_file, source_file):
+    """Arrays of a stage cache, or None if missing, outdated or stale
+
+    A cache is trusted without a stamp check when the input file is not
+    present, so exports can be rerun from intermediates alone.
+    """
+    if not os.path.exists(cache_file):
+        return None
+
+    with np.load(cache_file) as npz:
+        cache = {key: npz[key] for key in npz.files}
+
+    if int(cache.pop('version')) != STAGE_CACHE_VERSION:
+        return None
+    stamp = cache.pop('source')
+    if os.path.exists(source_file) and not np.array_equal(stamp, source_stamp(source_file)):
+        print(f"[WARN] {cache_file} is older than {source_file}, ignoring it")
+        return None
+    return cache
+
+
+def input_fingerprint(path):
+    """SHA-1 of the input file's content, or None when it is absent"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_stage_stamps(stamps_file):
+    """{stage: {'input', 'compression', 'paths'}} of the last run of each stage"""
+    if not os.path.exists(stamps_file):
+        return {}
+    with open(stamps_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_stage_stamps(stamps_file, stamps):
+    os.makedirs(os.path.dirname(stamps_file) or '.', exist_ok=True)
+    temp_file = stamps_file + '.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(stamps, f, indent=2)
+    os.replace(temp_file, stamps_file)
+
 
 class BibleDataProcessor:
-    def __init__(self, cross_ref_file):
+    def __init__(self, cross_ref_file, streaming=False, chunk_size=65536, workers=None):
         self.cross_ref_file = cross_ref_file
-        self.verse_refs = []
-        self.chapter_refs = []
-        self.book_refs = []
+        # Streaming mode never holds the verse-level rows in memory;
+        # every stage re-reads the file in chunks of chunk_size rows
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        # workers > 1 parses newline-aligned shards in a process pool
+        self.workers = workers
+        self.verse_refs = None
+        self.counts = None
+        # Set by load_incremental: chapters touched since the previous run,
+        # and the fingerprint of the input that run saw
+        self.changed_chapters = None
+        self.previous_input = None
+        self.total_verse_refs = 0
+        self.chapter_edges = None
+        self.edge_votes = None
+        self.vote_layers = None
+        self.chapter_csr = None
+        self.verse_index = None
+        self.edge_rankings = None
+        self.book_pairs = None
+        self.graph_metrics = None
+        self.layouts = None
+        self.section_index = None
+        self.book_refs = None
 
     def parse_reference(self, ref_str):
         """Parse Gen.1.1 format to structured data"""
@@ -114,186 +765,1303 @@ class BibleDataProcessor:
                 }
         return None
 
+    def parse_reference_compact(self, ref_str):
+        """Parse Gen.1.1 format to a (book_index, chapter, verse) tuple"""
+        # Handle ranges like Ps.23.1-Ps.23.2
+        if '-' in ref_str:
+            ref_str = ref_str.split('-')[0]
+
+        parts = ref_str.split('.')
+        if len(parts) >= 3:
+            book_index = ABBREV_TO_INDEX.get(parts[0])
+            if book_index is not None:
+                return book_index, int(parts[1]), int(parts[2])
+        return None
+
+    def iter_cross_references(self, start=None, end=None):
+        """Stream compact VerseRef records from the file, one row at a time
+
+        start/end restrict the read to a byte range produced by
+        find_shard_ranges(); by default the whole file after the header.
+        """
+        with open(self.cross_ref_file, 'rb') as f:
+            if start is None:
+                f.readline()  # Skip header
+            else:
+                f.seek(start)
+            position = f.tell()
+
+            for raw_line in f:
+                if end is not None and position >= end:
+                    break
+                position += len(raw_line)
+
+                parts = raw_line.decode('utf-8').strip().split('\t')
+                if len(parts) >= 3:
+                    from_ref = self.parse_reference_compact(parts[0])
+                    to_ref = self.parse_reference_compact(parts[1])
+
+                    try:
+                        votes = int(parts[2])
+                    except ValueError:
+                        votes = 0
+
+                    if from_ref and to_ref:
+                        yield VerseRef(*from_ref, *to_ref, votes)
+
+    def iter_column_chunks(self, start=None, end=None):
+        """Stream the file as VerseRefColumns chunks of at most chunk_size rows"""
+        batch = []
+        for ref in self.iter_cross_references(start, end):
+            batch.append(ref)
+            if len(batch) >= self.chunk_size:
+                yield VerseRefColumns.from_records(batch)
+                batch = []
+        if batch:
+            yield VerseRefColumns.from_records(batch)
+
+    def iter_verse_chunks(self):
+        """Iterate column chunks from memory, or from disk when not loaded"""
+        if self.verse_refs is not None:
+            yield self.verse_refs
+        else:
+            yield from self.iter_column_chunks()
+
+    def collect_counts(self):
+        """Reduce the partial counts of every chunk (computed once, then cached)"""
+        if self.counts is None:
+            total = None
+            for chunk in self.iter_verse_chunks():
+                total = merge_counts(total, count_chunk(chunk))
+            if total is None:
+                total = count_chunk(VerseRefColumns.from_records([]))
+            self.counts = total
+            self.total_verse_refs = total['rows']
+        return self.counts
+
+    def count_parallel(self):
+        """Parse newline-aligned shards in worker processes and reduce their counts
+
+        Each shard returns sparse partials, which are scatter-added into
+        one set of dense totals here.
+        """
+        ranges = find_shard_ranges(self.cross_ref_file, shard_count(self.cross_ref_file))
+        tasks = [(self.cross_ref_file, start, end, self.chunk_size) for start, end in ranges]
+
+        total = count_chunk(VerseRefColumns.from_records([]))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for partial in executor.map(_count_shard, tasks):
+                apply_sparse_counts(total, partial, 1)
+
+        self.counts = total
+        self.total_verse_refs = total['rows']
+        return total
+
     def load_cross_references(self):
         """Load and parse cross-references"""
+        if self.workers and self.workers > 1:
+            print(f"Parsing cross-references with {self.workers} worker processes...")
+            self.count_parallel()
+            print(f"Counted {self.total_verse_refs} verse-level cross-references")
+            return
+
+        if self.streaming:
+            # Rows are consumed incrementally by the aggregation stages
+            print("Streaming cross-references (rows are not held in memory)...")
+            return
+
         print("Loading cross-references...")
 
-        with open(self.cross_ref_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()[1:]  # Skip header
+        self.verse_refs = VerseRefColumns.concatenate(self.iter_column_chunks())
+        self.total_verse_refs = len(self.verse_refs)
+
+        print(f"Loaded {self.total_verse_refs} verse-level cross-references")
+
+    def load_incremental(self, cache_file):
+        """Update the counts of a previous run, re-parsing only changed chunks
+
+        Chunks whose content hash is in the cache reuse their stored
+        partial counts; the totals are patched by subtracting the chunks
+        that disappeared and adding the ones that are new. The aggregation
+        and export stages then run on the patched counts as usual.
+        When no chunk changed, the cache is left as it is.
+        """
+        print("Checking cross-references for changes...")
+
+        current = list(iter_content_chunks(self.cross_ref_file))
+        hashes = [digest for digest, _, _ in current]
+        previous = load_incremental_cache(cache_file)
+
+        if previous is None:
+            print("No usable incremental cache, building one from scratch")
+            totals = count_chunk(VerseRefColumns.from_records([]))
+            chunks = {}
+            removed = Counter()
+        else:
+            totals = previous['totals']
+            chunks = previous['chunks']
+            removed = Counter(previous['hashes']) - Counter(hashes)
+
+        added = Counter(hashes) - (Counter(previous['hashes']) if previous else Counter())
+        ranges = {digest: (start, end) for digest, start, end in current}
+
+        # Parse only the chunks that were not seen before
+        for digest in added:
+            if digest not in chunks:
+                start, end = ranges[digest]
+                columns = VerseRefColumns.concatenate(self.iter_column_chunks(start, end))
+                chunks[digest] = sparse_count_chunk(columns)
 
-        for line in lines:
-            parts = line.strip().split('\t')
-            if len(parts) >= 3:
-                from_ref = self.parse_reference(parts[0])
-                to_ref = self.parse_reference(parts[1])
+        touched_chapter_cells = set()
+        touched_book_cells = set()
+        for changes in (removed, added):
+            for digest in changes:
+                touched_chapter_cells.update(chunks[digest]['chapter_cells'].tolist())
+                touched_book_cells.update(chunks[digest]['book_cells'].tolist())
+        cells = np.fromiter(touched_chapter_cells, dtype=np.int64, count=len(touched_chapter_cells))
+        chapter_keys = ('chapter_weights', 'chapter_positive', 'chapter_negative', 'chapter_refs')
+        before = [totals[key][cells] for key in chapter_keys]
 
-                try:
-                    votes = int(parts[2])
-                except:
-                    votes = 0
+        for changes, sign in ((removed, -1), (added, 1)):
+            for digest, times in changes.items():
+                for _ in range(times):
+                    apply_sparse_counts(totals, chunks[digest], sign)
 
-                if from_ref and to_ref:
-                    self.verse_refs.append({
-                        'from': from_ref,
-                        'to': to_ref,
-                        'votes': votes
-                    })
+        if previous is not None and not added and not removed:
+            print(f"None of {len(hashes)} chunks changed, keeping {cache_file}")
+        else:
+            # Drop partials of chunks that no longer occur before saving
+            chunks = {digest: chunks[digest] for digest in set(hashes)}
+            save_incremental_cache(cache_file, hashes, chunks, totals,
+                                   input_fingerprint(self.cross_ref_file))
 
-        print(f"Loaded {len(self.verse_refs)} verse-level cross-references")
+        self.counts = totals
+        self.total_verse_refs = totals['rows']
+        if previous is not None:
+            # A rewritten chunk mostly repeats its old counts; only cells
+            # whose totals moved change any chapter's outputs
+            moved = np.zeros(len(cells), dtype=bool)
+            for key, old in zip(chapter_keys, before):
+                moved |= totals[key][cells] != old
+            cells = cells[moved]
+            self.changed_chapters = np.union1d(cells // TOTAL_CHAPTERS, cells % TOTAL_CHAPTERS)
+            self.previous_input = previous['input'] or None
+
+        print(f"{sum(added.values())} of {len(hashes)} chunks changed "
+              f"({sum(removed.values())} removed); recomputed "
+              f"{len(touched_chapter_cells)} chapter cells and {len(touched_book_cells)} book cells")
 
     def aggregate_to_chapters(self):
         """Aggregate verse references to chapter level"""
         print("Aggregating to chapter level...")
 
-        chapter_connections = defaultdict(lambda: defaultdict(int))
-
-        for ref in self.verse_refs:
-            from_chapter = f"{ref['from']['book']} {ref['from']['chapter']}"
-            to_chapter = f"{ref['to']['book']} {ref['to']['chapter']}"
-
-            if from_chapter != to_chapter:
-                chapter_connections[from_chapter][to_chapter] += abs(ref['votes'])
+        counts = self.collect_counts()
+        weights = counts['chapter_weights']
 
-        # Convert to list
-        for from_ch, connections in chapter_connections.items():
-            for to_ch, weight in connections.items():
-                self.chapter_refs.append({
-                    'from': from_ch,
-                    'to': to_ch,
-                    'weight': weight
-                })
+        # A pair exists once any reference links it, even with zero votes
+        flat_edges = np.flatnonzero(counts['chapter_refs'])
+        self.chapter_edges = ChapterEdges(
+            source=(flat_edges // TOTAL_CHAPTERS).astype(np.int32),
+            target=(flat_edges % TOTAL_CHAPTERS).astype(np.int32),
+            weight=weights[flat_edges]
+        )
+        self.edge_votes = EdgeVotes(
+            positive=counts['chapter_positive'][flat_edges],
+            negative=counts['chapter_negative'][flat_edges]
+        )
+        self.vote_layers = None
 
-        print(f"Created {len(self.chapter_refs)} chapter-level connections")
+        print(f"Created {len(flat_edges)} chapter-level connections")
 
     def aggregate_to_books(self):
         """Aggregate to book level for matrix visualization"""
         print("Aggregating to book level...")
 
-        book_connections = defaultdict(lambda: defaultdict(int))
+        counts = self.collect_counts()
+        self.book_refs = counts['book_weights'].reshape(TOTAL_BOOKS, TOTAL_BOOKS)
+        print(f"Created 66x66 book connection matrix")
 
-        for ref in self.verse_refs:
-            from_book = ref['from']['book']
-            to_book = ref['to']['book']
+    def save_counts(self, cache_file):
+        """Cache the reduced counts of the parse stage (occupied cells only)"""
+        save_stage_cache(cache_file, self.cross_ref_file, sparse_totals(self.collect_counts()))
 
-            if from_book != to_book:
-                book_connections[from_book][to_book] += abs(ref['votes'])
+    def load_counts(self, cache_file):
+        """Restore cached counts; returns False if there is no usable cache"""
+        cache = load_stage_cache(cache_file, self.cross_ref_file)
+        if cache is None:
+            return False
 
-        # Convert to matrix format
-        matrix = [[0] * 66 for _ in range(66)]
+        self.counts = dense_totals(cache)
+        self.total_verse_refs = self.counts['rows']
+        return True
 
-        for from_book, connections in book_connections.items():
-            from_idx = BOOK_TO_INDEX.get(from_book)
-            if from_idx is not None:
-                for to_book, count in connections.items():
-                    to_idx = BOOK_TO_INDEX.get(to_book)
-                    if to_idx is not None:
-                        matrix[from_idx][to_idx] = count
+    def save_aggregates(self, cache_file):
+        """Cache the chapter edges and book matrix of the aggregate stage"""
+        save_stage_cache(cache_file, self.cross_ref_file, {
+            'total_verse_refs': np.array(self.total_verse_refs),
+            'edge_source': self.chapter_edges.source,
+            'edge_target': self.chapter_edges.target,
+            'edge_weight': self.chapter_edges.weight,
+            'edge_positive': self.edge_votes.positive,
+            'edge_negative': self.edge_votes.negative,
+            'book_refs': self.book_refs
+        })
 
-        self.book_refs = matrix
-        print(f"Created 66x66 book connection matrix")
+    def load_aggregates(self, cache_file):
+        """Restore cached aggregates; returns False if there is no usable cache"""
+        cache = load_stage_cache(cache_file, self.cross_ref_file)
+        if cache is None:
+            return False
+
+        self.total_verse_refs = int(cache['total_verse_refs'])
+        self.chapter_edges = ChapterEdges(cache['edge_source'], cache['edge_target'], cache['edge_weight'])
+        self.edge_votes = EdgeVotes(cache['edge_positive'], cache['edge_negative'])
+        self.vote_layers = None
+        self.book_refs = cache['book_refs']
+        self.chapter_csr = None
+        self.edge_rankings = None
+        self.book_pairs = None
+        self.graph_metrics = None
+        self.layouts = None
+        return True
+
+    def build_chapter_csr(self):
+        """Chapter adjacency in CSR form, outgoing and incoming
+
+        Neighbors of chapter X are indices[indptr[X]:indptr[X + 1]], so a
+        per-chapter query is a slice. Edges are already sorted by source,
+        so the outgoing side reuses the edge arrays; in_edges maps each
+        incoming slot back to its position in the edge list.
+        """
+        print("Building chapter CSR adjacency...")
+
+        source, target, weight = self.chapter_edges
+
+        def indptr_for(keys):
+            indptr = np.zeros(TOTAL_CHAPTERS + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys, minlength=TOTAL_CHAPTERS), out=indptr[1:])
+            return indptr
 
-    def export_for_web(self, output_file):
-        """Export data in web-friendly JSON format"""
+        in_edges = np.lexsort((source, target))
+        self.chapter_csr = {
+            'out_indptr': indptr_for(source),
+            'out_indices': target,
+            'out_weights': weight,
+            'in_indptr': indptr_for(target),
+            'in_indices': source[in_edges],
+            'in_weights': weight[in_edges],
+            'in_edges': in_edges.astype(np.int32)
+        }
+        return self.chapter_csr
+
+    def build_edge_rankings(self, top_k=TOP_K_NEIGHBORS):
+        """Weight-ordered edge permutation plus per-chapter top-K edge lists
+
+        weight_order lists edge ids by weight descending (ties keep edge
+        order, like a stable sort), so the top N edges are its first N
+        entries. top_edges[top_indptr[X]:top_indptr[X + 1]] holds the
+        heaviest top_k edges touching chapter X in either direction.
+        """
+        print("Ranking edges by weight...")
+
+        source, target, weight = self.chapter_edges
+        edge_ids = np.arange(len(source), dtype=np.int32)
+
+        # Each edge once per endpoint; self-loops only once
+        loop = source == target
+        nodes = np.concatenate((source, target[~loop]))
+        edges = np.concatenate((edge_ids, edge_ids[~loop]))
+        order = np.lexsort((edges, -weight[edges], nodes))
+        nodes, edges = nodes[order], edges[order]
+
+        node_start = np.zeros(TOTAL_CHAPTERS + 1, dtype=np.int64)
+        np.cumsum(np.bincount(nodes, minlength=TOTAL_CHAPTERS), out=node_start[1:])
+        keep = np.arange(len(nodes)) - node_start[nodes] < top_k
+
+        top_indptr = np.zeros(TOTAL_CHAPTERS + 1, dtype=np.int64)
+        np.cumsum(np.minimum(np.diff(node_start), top_k), out=top_indptr[1:])
+
+        self.edge_rankings = {
+            'top_k': top_k,
+            'weight_order': np.argsort(-weight, kind='stable').astype(np.int32),
+            'top_indptr': top_indptr,
+            'top_edges': edges[keep]
+        }
+        return self.edge_rankings
+
+    def build_book_pair_index(self):
+        """Edge ids bucketed by (source book, target book), heaviest first
+
+        order lists edge ids sorted by source book, target book, then
+        weight descending (ties keep edge order). The edges from book A to
+        book B are order[offsets[A * 66 + B]:offsets[A * 66 + B + 1]], and
+        all edges leaving book A are the single range starting at
+        offsets[A * 66] and ending at offsets[A * 66 + 66].
+        """
+        print("Bucketing edges by book pair...")
+
+        source, target, weight = self.chapter_edges
+        chapter_book = np.repeat(np.arange(TOTAL_BOOKS), BOOK_CHAPTER_COUNTS)
+        pair = chapter_book[source] * TOTAL_BOOKS + chapter_book[target]
+        order = np.lexsort((np.arange(len(source)), -weight, pair))
+
+        offsets = np.zeros(TOTAL_BOOKS * TOTAL_BOOKS + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pair, minlength=TOTAL_BOOKS * TOTAL_BOOKS), out=offsets[1:])
+
+        self.book_pairs = {
+            'order': order.astype(np.int32),
+            'offsets': offsets
+        }
+        return self.book_pairs
+
+    def book_pair_edge_ids(self, source_book, target_book):
+        """Edge ids from one book to another, heaviest first (book indices 0-65)"""
+        pairs = self.book_pairs or self.build_book_pair_index()
+        bucket = source_book * TOTAL_BOOKS + target_book
+        return pairs['order'][pairs['offsets'][bucket]:pairs['offsets'][bucket + 1]]
+
+    def build_graph_metrics(self, betweenness_samples=None, seed=0):
+        """Per-chapter communities and centrality (see graph_metrics.py)
+
+        Returns (arrays, summary): each array is indexed by chapter id.
+        Requires SciPy; communities also need networkx.
+        """
+        print("Computing communities and centrality...")
+
+        if betweenness_samples is None:
+            betweenness_samples = graph_metrics.BETWEENNESS_SAMPLES
+        source, target, weight = self.chapter_edges
+        arrays, summary = graph_metrics.compute_metrics(source, target, weight, TOTAL_CHAPTERS,
+                                                        betweenness_samples=betweenness_samples,
+                                                        seed=seed)
+        if 'community' not in arrays:
+            print("[WARN] networkx not installed, skipping Louvain communities")
+        else:
+            print(f"Found {summary['communities']} communities (modularity {summary['modularity']:.3f})")
+
+        self.graph_metrics = (arrays, summary)
+        return self.graph_metrics
+
+    def export_graph_metrics(self, binary_file, json_file, compress=True):
+        """Export per-chapter metrics as a bundle (desktop) and compact JSON (web)"""
+        print(f"Exporting graph metrics to {binary_file} and {json_file}...")
+
+        arrays, summary = self.graph_metrics or self.build_graph_metrics()
+        metadata = {'total_chapters': TOTAL_CHAPTERS, **summary}
+        write_bundle(binary_file, arrays, metadata)
+
+        data = dict(metadata)
+        for key, values in arrays.items():
+            if values.dtype.kind == 'f':
+                data[key] = [float(f'{v:.6g}') for v in values.tolist()]
+            else:
+                data[key] = values.tolist()
+        with CompressedTextWriter(json_file, compress) as out:
+            out.write(compact_json(data))
+
+        print(f"[OK] Graph metrics exported")
+
+    def build_layouts(self, iterations=LAYOUT_ITERATIONS, seed=0):
+        """2D and 3D force-directed positions of all chapters (see graph_layout.py)
+
+        Row X of each array is chapter X, scaled to [-1, 1].
+        """
+        self.layouts = {}
+        for dim in (2, 3):
+            print(f"Laying out {TOTAL_CHAPTERS} chapters in {dim}D ({iterations} iterations)...")
+            self.layouts[f'position_{dim}d'] = force_layout(
+                self.chapter_edges.source, self.chapter_edges.target, self.chapter_edges.weight,
+                TOTAL_CHAPTERS, dim=dim, iterations=iterations, seed=seed)
+        return self.layouts
+
+    def export_layouts(self, binary_file, json_file, iterations=LAYOUT_ITERATIONS, seed=0,
+                       compress=True):
+        """Export chapter positions as a bundle (desktop) and compact JSON (web)"""
+        print(f"Exporting chapter layouts to {binary_file} and {json_file}...")
+
+        layouts = self.layouts or self.build_layouts(iterations, seed)
+        metadata = {'total_chapters': TOTAL_CHAPTERS, 'iterations': iterations, 'seed': seed,
+                    'model': 'fruchterman-reingold'}
+        write_bundle(binary_file, layouts, metadata)
+
+        data = dict(metadata)
+        for key, positions in layouts.items():
+            data[key] = np.round(positions.astype(np.float64), 4).tolist()
+        with CompressedTextWriter(json_file, compress) as out:
+            out.write(compact_json(data))
+
+        print(f"[OK] Chapter layouts exported")
+
+    def build_section_index(self, section_file=SECTION_FILE):
+        """Interval tree of the translation sections, with cross-reference totals
+
+        Each section gets the number of references starting and ending in
+        it (and their summed absolute votes); overlapping sections each
+        count a reference that falls inside both.
+        """
+        print(f"Building section index from {section_file}...")
+
+        index = SectionIndex.from_file(section_file, [b['abbrev'] for b in BIBLE_BOOKS])
+        verse_ids = all_verse_ids(index.sections)
+
+        columns = self.verse_refs
+        if columns is None:
+            columns = VerseRefColumns.concatenate(self.iter_verse_chunks())
+        index.count_references(verse_ids, columns.from_verse_id, columns.to_verse_id, columns.votes)
+
+        self.section_index = index
+        print(f"Indexed {len(index)} sections over {len(verse_ids)} verses")
+        return index
+
+    def export_section_index(self, output_file, section_file=SECTION_FILE, compress=True):
+        """Export the section index as compact JSON for the reader and Sankey view"""
+        print(f"Exporting section index to {output_file}...")
+
+        index = self.section_index or self.build_section_index(section_file)
+        with CompressedTextWriter(output_file, compress) as out:
+            out.write(compact_json(index.to_dict(BIBLE_BOOKS)))
+
+        print(f"[OK] Section index exported")
+
+    def build_vote_layers(self, thresholds=VOTE_THRESHOLDS):
+        """Edges ordered by net votes so every quality threshold is a prefix
+
+        net = positive - negative votes. net_order lists edge ids by net
+        descending (ties keep edge order), and the edges with net >= t are
+        net_order[:count] where count is layer_counts[i] for t =
+        thresholds[i] (or a binary search in net_sorted for any other t).
+        """
+        print("Building vote-threshold layers...")
+
+        net = self.edge_votes.positive - self.edge_votes.negative
+        order = np.argsort(-net, kind='stable')
+        net_sorted = net[order]
+        # net_sorted is descending, so net >= t is the prefix where -net <= -t
+        layer_counts = np.searchsorted(-net_sorted, -np.asarray(thresholds), side='right')
+
+        self.vote_layers = {
+            'thresholds': np.asarray(thresholds, dtype=np.int64),
+            'layer_counts': layer_counts.astype(np.int64),
+            'net_order': order.astype(np.int32),
+            'net_sorted': net_sorted
+        }
+        return self.vote_layers
+
+    def export_book_pair_index(self, output_file, compress=True):
+        """Export the book-pair buckets as compact JSON for the API
+
+        Edge ids index the connections of graph_data.json.
+        """
+        print(f"Exporting book-pair index to {output_file}...")
+
+        pairs = self.book_pairs or self.build_book_pair_index()
+        data = {
+            'total_books': TOTAL_BOOKS,
+            'total_connections': len(self.chapter_edges.source),
+            'books': [b['name'] for b in BIBLE_BOOKS],
+            'order': pairs['order'].tolist(),
+            'offsets': pairs['offsets'].tolist()
+        }
+
+        with CompressedTextWriter(output_file, compress) as out:
+            out.write(compact_json(data))
+
+        print(f"[OK] Book-pair index exported")
+
+    def export_vote_layers(self, output_file, compress=True):
+        """Export vote totals and threshold layers as compact JSON
+
+        Edge ids index the connections of graph_data.json.
+        """
+        print(f"Exporting vote-threshold layers to {output_file}...")
+
+        layers = self.vote_layers or self.build_vote_layers()
+        data = {
+            'total_connections': len(self.chapter_edges.source),
+            'thresholds': layers['thresholds'].tolist(),
+            'layer_counts': layers['layer_counts'].tolist(),
+            'net_order': layers['net_order'].tolist(),
+            'net_sorted': layers['net_sorted'].tolist(),
+            'positive': self.edge_votes.positive.tolist(),
+            'negative': self.edge_votes.negative.tolist()
+        }
+
+        with CompressedTextWriter(output_file, compress) as out:
+            out.write(compact_json(data))
+
+        print(f"[OK] Vote-threshold layers exported")
+
+    def build_lod_pyramid(self, section_file=SECTION_FILE, min_agreement=DEFAULT_MIN_AGREEMENT):
+        """Book, chapter, section and verse graphs linked parent to child
+
+        Sections are pericopes that at least min_agreement translations
+        start, cut at chapter breaks so every level nests in the one above:
+        book -> chapter -> section -> verse. Node ids are canonical positions
+        within a level, and the children of node p at one level are the
+        contiguous ids children[p]:children[p + 1] of the next. Edge weights
+        are summed absolute votes, as for chapters.
+
+        Every level aggregates the same verse-level rows: references to
+        verses missing from the section table (other versifications) are
+        dropped throughout, and a reference counts at a level only when its
+        ends lie in different nodes there (no self-loops, as in the chapter
+        edges and book_matrix).
+        """
+        print("Building level-of-detail pyramid...")
+
+        sections = (self.section_index or self.build_section_index(section_file)).sections
+        verse_ids = all_verse_ids(sections)
+        section_start, section_end = partition_sections(sections, verse_ids, min_agreement)
+
+        verse_section = np.searchsorted(section_start, verse_ids, side='right') - 1
+        start_book = section_start // 1000000 - 1
+        section_chapter = BOOK_CHAPTER_OFFSETS[start_book] + (section_start // 1000) % 1000 - 1
+        chapter_book = np.repeat(np.arange(TOTAL_BOOKS), BOOK_CHAPTER_COUNTS)
+
+        def children(parent, total_parents):
+            indptr = np.zeros(total_parents + 1, dtype=np.int64)
+            np.cumsum(np.bincount(parent, minlength=total_parents), out=indptr[1:])
+            return indptr
+
+        columns = self.verse_refs
+        if columns is None:
+            columns = VerseRefColumns.concatenate(self.iter_verse_chunks())
+
+        # Verses missing from the section table (other versifications) are dropped
+        from_pos = np.searchsorted(verse_ids, columns.from_verse_id).clip(max=len(verse_ids) - 1)
+        to_pos = np.searchsorted(verse_ids, columns.to_verse_id).clip(max=len(verse_ids) - 1)
+        known = (verse_ids[from_pos] == columns.from_verse_id) & (verse_ids[to_pos] == columns.to_verse_id)
+        from_pos, to_pos = from_pos[known], to_pos[known]
+        weight = np.abs(columns.votes[known].astype(np.int64))
+
+        # Node of every verse at each level; sections never cross chapters
+        verse_chapter = section_chapter[verse_section]
+        verse_nodes = {
+            'book': (chapter_book[verse_chapter], TOTAL_BOOKS),
+            'chapter': (verse_chapter, TOTAL_CHAPTERS),
+            'section': (verse_section, len(section_start)),
+            'verse': (np.arange(len(verse_ids)), len(verse_ids))
+        }
+        levels = {}
+        for level, (node, total_nodes) in verse_nodes.items():
+            source, target = node[from_pos], node[to_pos]
+            between = source != target
+            levels[level] = aggregate_pairs(source[between], target[between], weight[between], total_nodes)
+
+        pyramid = {
+            'chapter_parent': chapter_book.astype(np.int16),
+            'section_start': section_start,
+            'section_end': section_end,
+            'section_parent': section_chapter.astype(np.int16),
+            'verse_id': verse_ids,
+            'verse_parent': verse_section.astype(np.int32),
+            'book_children': children(chapter_book, TOTAL_BOOKS),
+            'chapter_children': children(section_chapter, TOTAL_CHAPTERS),
+            'section_children': children(verse_section, len(section_start))
+        }
+        for level, edges in levels.items():
+            pyramid[f'{level}_edge_source'] = edges.source.astype(np.int32)
+            pyramid[f'{level}_edge_target'] = edges.target.astype(np.int32)
+            pyramid[f'{level}_edge_weight'] = compact_int_array(edges.weight)
+
+        print(f"Pyramid: {TOTAL_BOOKS} books, {TOTAL_CHAPTERS} chapters, "
+              f"{len(section_start)} sections, {len(verse_ids)} verses "
+              f"({int((~known).sum())} references to unknown verses skipped)")
+        return pyramid
+
+    def export_lod_pyramid(self, output_file, section_file=SECTION_FILE,
+                           min_agreement=DEFAULT_MIN_AGREEMENT):
+        """Export the level-of-detail pyramid as a memory-mappable bundle"""
+        print(f"Exporting level-of-detail pyramid to {output_file}...")
+
+        pyramid = self.build_lod_pyramid(section_file, min_agreement)
+        metadata = {
+            'levels': ['book', 'chapter', 'section', 'verse'],
+            'nodes': {
+                'book': TOTAL_BOOKS,
+                'chapter': TOTAL_CHAPTERS,
+                'section': len(pyramid['section_start']),
+                'verse': len(pyramid['verse_id'])
+            },
+            'edges': {level: len(pyramid[f'{level}_edge_source'])
+                      for level in ('book', 'chapter', 'section', 'verse')},
+            'section_min_agreement': min_agreement,
+            'verse_id_encoding': 'BBCCCVVV: book_number * 1000000 + chapter * 1000 + verse (book_number 1-66)',
+            'books': BIBLE_BOOKS
+        }
+
+        write_bundle(output_file, pyramid, metadata)
+        print(f"[OK] Level-of-detail pyramid exported")
+
+    def build_verse_index(self):
+        """Verse-level CSR index of the raw cross-references
+
+        Rows are every verse that appears on either side (sorted BBCCCVVV
+        ids); each row lists its targets by votes descending, so the top-k
+        references of a verse are the first k entries of its slice.
+        """
+        print("Building verse-level cross-reference index...")
+
+        columns = self.verse_refs
+        if columns is None:
+            columns = VerseRefColumns.concatenate(self.iter_verse_chunks())
+
+        from_ids, to_ids, votes = columns.from_verse_id, columns.to_verse_id, columns.votes
+        verse_ids = np.unique(np.concatenate((from_ids, to_ids)))
+
+        # Source verse, then votes descending, then target for a stable order
+        order = np.lexsort((to_ids, -votes.astype(np.int64), from_ids))
+        rows = np.searchsorted(verse_ids, from_ids[order])
+
+        indptr = np.zeros(len(verse_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(verse_ids)), out=indptr[1:])
+
+        self.verse_index = {
+            'verse_ids': verse_ids.astype(np.int32),
+            'indptr': indptr,
+            'target_ids': to_ids[order],
+            'votes': votes[order]
+        }
+        print(f"Indexed {len(order)} references across {len(verse_ids)} verses")
+        return self.verse_index
+
+    def export_for_web(self, output_file, columnar=False, compress=True):
+        """Export data in web-friendly JSON format
+
+        The file is streamed out with compact separators, connections in
+        chunks, so the full edge list never exists as Python dicts. With
+        columnar=True the edges are written as parallel integer arrays
+        under 'connection_columns' instead of one object per edge
+        (data-loader.js expands them). compress (True or a Compression)
+        also writes .gz and, when the brotli module is installed, .br
+        siblings.
+        """
         print(f"Exporting web data to {output_file}...")
 
         # Prepare chapter nodes (for arc diagram)
-        chapter_nodes = []
-        chapter_index = 0
-
-        for book in BIBLE_BOOKS:
-            for ch in range(1, book['chapters'] + 1):
-                chapter_nodes.append({
-                    'id': chapter_index,
-                    'label': f"{book['name']} {ch}",
+        chapter_nodes = build_chapter_nodes()
+        source = self.chapter_edges.source
+        target = self.chapter_edges.target
+        weight = self.chapter_edges.weight
+
+        metadata = {
+            'total_books': 66,
+            'total_chapters': len(chapter_nodes),
+            'total_connections': len(source),
+            'total_verse_refs': self.total_verse_refs
+        }
+        if columnar:
+            metadata['connection_encoding'] = 'columnar'
+
+        with CompressedTextWriter(output_file, compress) as out:
+            out.write('{"metadata":' + compact_json(metadata))
+            out.write(',"books":' + compact_json(BIBLE_BOOKS))
+            out.write(',"chapters":' + compact_json(chapter_nodes))
+
+            if columnar:
+                out.write(',"connection_columns":{')
+                for i, (key, values) in enumerate((('source', source), ('target', target),
+                                                   ('weight', weight))):
+                    out.write(('"' if i == 0 else ',"') + key + '":[')
+                    for start in range(0, len(values), EDGE_WRITE_CHUNK):
+                        chunk = values[start:start + EDGE_WRITE_CHUNK].tolist()
+                        out.write((',' if start else '') + ','.join(map(str, chunk)))
+                    out.write(']')
+                out.write('}')
+            else:
+                out.write(',"connections":[')
+                for start in range(0, len(source), EDGE_WRITE_CHUNK):
+                    end = start + EDGE_WRITE_CHUNK
+                    edges = ','.join(
+                        f'{{"source":{s},"target":{t},"weight":{w}}}'
+                        for s, t, w in zip(source[start:end].tolist(),
+                                           target[start:end].tolist(),
+                                           weight[start:end].tolist())
+                    )
+                    out.write((',' if start else '') + edges)
+                out.write(']')
+
+            out.write(',"book_matrix":' + compact_json(self.book_refs.tolist()) + '}')
+
+        for path in out.outputs():
+            print(f"  {path}: {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+        print(f"[OK] Web data exported successfully")
+
+    def export_chapter_csr(self, output_file, compress=True):
+        """Export the chapter CSR adjacency as compact JSON for the web/API
+
+        The book list rides along so a chapter query can name its chapters
+        without fetching graph_data.json.
+        """
+        print(f"Exporting chapter CSR adjacency to {output_file}...")
+
+        csr = self.chapter_csr or self.build_chapter_csr()
+        data = {'total_chapters': TOTAL_CHAPTERS, 'books': BIBLE_BOOKS}
+        for direction in ('out', 'in'):
+            data[direction] = {
+                'indptr': csr[f'{direction}_indptr'].tolist(),
+                'indices': csr[f'{direction}_indices'].tolist(),
+                'weights': csr[f'{direction}_weights'].tolist()
+            }
+
+        with CompressedTextWriter(output_file, compress) as out:
+            out.write(compact_json(data))
+
+        print(f"[OK] Chapter CSR exported")
+
+    def export_shards(self, output_dir, compress=False, chapters=None):
+        """Export per-book and per-chapter edge shards plus a manifest
+
+        books/<abbrev>.json and chapters/<id>.json hold only the edges
+        touching that unit (in graph_data.json order), so the API can
+        answer a book or chapter query without the full graph.
+
+        chapters limits the rewrite to those chapter ids and their books
+        (the rest of output_dir is assumed current, as after an incremental
+        run that touched only these chapters); None rewrites every shard.
+        The manifest is always rewritten.
+        """
+        print(f"Exporting book and chapter shards to {output_dir}...")
+
+        csr = self.chapter_csr or self.build_chapter_csr()
+        source, target, weight = self.chapter_edges
+        out_indptr, in_indptr, in_edges = csr['out_indptr'], csr['in_indptr'], csr['in_edges']
+        chapter_book = np.repeat(np.arange(TOTAL_BOOKS), BOOK_CHAPTER_COUNTS)
+
+        # Edges touching each chapter and book, for the manifest (chapter
+        # edges are never self-loops, so out + in counts each edge once)
+        chapter_connections = (np.diff(out_indptr) + np.diff(in_indptr)).tolist()
+        source_book, target_book = chapter_book[source], chapter_book[target]
+        book_connections = (np.bincount(source_book, minlength=TOTAL_BOOKS)
+                            + np.bincount(target_book, minlength=TOTAL_BOOKS)
+                            - np.bincount(source_book[source_book == target_book], minlength=TOTAL_BOOKS))
+
+        if chapters is None:
+            write_chapters = np.ones(TOTAL_CHAPTERS, dtype=bool)
+        else:
+            write_chapters = np.zeros(TOTAL_CHAPTERS, dtype=bool)
+            write_chapters[np.asarray(chapters, dtype=np.int64)] = True
+        write_books = np.bincount(chapter_book, weights=write_chapters, minlength=TOTAL_BOOKS) > 0
+
+        def touching(first, last):
+            """Edge ids with either endpoint in chapters [first, last)"""
+            outgoing = np.arange(out_indptr[first], out_indptr[last])
+            return np.union1d(outgoing, in_edges[in_indptr[first]:in_indptr[last]])
+
+        def connections(edge_ids):
+            return [{'source': s, 'target': t, 'weight': w} for s, t, w in
+                    zip(source[edge_ids].tolist(), target[edge_ids].tolist(), weight[edge_ids].tolist())]
+
+        def write_shard(path, data):
+            with CompressedTextWriter(path, compress) as out:
+                out.write(compact_json(data))
+
+        for subdir in ('books', 'chapters'):
+            os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
+
+        manifest_books = []
+        for b, book in enumerate(BIBLE_BOOKS):
+            first = int(BOOK_CHAPTER_OFFSETS[b])
+            last = first + book['chapters']
+            if write_books[b]:
+                write_shard(os.path.join(output_dir, 'books', f"{book['abbrev']}.json"), {
                     'book': book['name'],
-                    'chapter': ch,
-                    'book_index': BOOK_TO_INDEX[book['name']],
-                    'testament': book['testament']
+                    'abbrev': book['abbrev'],
+                    'chapter_range': [first, last],
+                    'connections': connections(touching(first, last))
                 })
-                chapter_index += 1
-
-        # Prepare edges with node indices
-        chapter_map = {node['label']: node['id'] for node in chapter_nodes}
-
-        edges = []
-        for ref in self.chapter_refs:
-            if ref['from'] in chapter_map and ref['to'] in chapter_map:
-                edges.append({
-                    'source': chapter_map[ref['from']],
-                    'target': chapter_map[ref['to']],
-                    'weight': ref['weight']
+            manifest_books.append({**book, 'chapter_offset': first,
+                                   'file': f"books/{book['abbrev']}.json",
+                                   'connections': int(book_connections[b])})
+
+        for chapter in build_chapter_nodes():
+            if write_chapters[chapter['id']]:
+                write_shard(os.path.join(output_dir, 'chapters', f"{chapter['id']}.json"), {
+                    'chapter': chapter,
+                    'connections': connections(touching(chapter['id'], chapter['id'] + 1))
                 })
 
-        web_data = {
+        manifest = {
+            'total_books': TOTAL_BOOKS,
+            'total_chapters': TOTAL_CHAPTERS,
+            'total_connections': len(source),
+            'total_verse_refs': self.total_verse_refs,
+            'books': manifest_books,
+            'chapter_file': 'chapters/{id}.json',
+            'chapter_connections': chapter_connections
+        }
+        with open(os.path.join(output_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, separators=COMPACT_SEPARATORS)
+
+        print(f"[OK] {int(write_books.sum())} book and {int(write_chapters.sum())} chapter shards exported")
+
+    def export_edge_rankings(self, output_file, compress=True):
+        """Export the weight ranking and per-chapter top-K lists as compact JSON
+
+        Edge ids index the connections of graph_data.json.
+        """
+        print(f"Exporting edge rankings to {output_file}...")
+
+        rankings = self.edge_rankings or self.build_edge_rankings()
+        data = {
+            'total_connections': len(self.chapter_edges.source),
+            'top_k': rankings['top_k'],
+            'weight_order': rankings['weight_order'].tolist(),
+            'chapter_top': {
+                'indptr': rankings['top_indptr'].tolist(),
+                'edges': rankings['top_edges'].tolist()
+            }
+        }
+
+        with CompressedTextWriter(output_file, compress) as out:
+            out.write(compact_json(data))
+
+        print(f"[OK] Edge rankings exported")
+
+    def export_packed_edges(self, output_file, weight_dtype=None, compress=True):
+        """Export the full graph as a packed edge file (see packed_edges.py)
+
+        Edges keep graph_data.json order. The header carries the metadata,
+        books and book matrix; chapters are omitted since data-loader.js
+        rebuilds them from the books.
+        """
+        print(f"Exporting packed edges to {output_file}...")
+
+        edges = self.chapter_edges
+        header = {
             'metadata': {
-                'total_books': 66,
-                'total_chapters': len(chapter_nodes),
-                'total_connections': len(edges),
-                'total_verse_refs': len(self.verse_refs)
+                'total_books': TOTAL_BOOKS,
+                'total_chapters': TOTAL_CHAPTERS,
+                'total_connections': len(edges.source),
+                'total_verse_refs': self.total_verse_refs,
+                'connection_encoding': 'packed'
             },
             'books': BIBLE_BOOKS,
-            'chapters': chapter_nodes,
-            'connections': edges,
-            'book_matrix': self.book_refs
+            'book_matrix': self.book_refs.tolist()
         }
+        levels = compression_levels(compress)
+        paths = write_packed_edges(output_file, edges.source, edges.target, edges.weight,
+                                   TOTAL_CHAPTERS, header=header, weight_dtype=weight_dtype,
+                                   compress=levels is not None,
+                                   gzip_level=levels.gzip_level if levels else None)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(web_data, f, indent=2)
+        for path in paths:
+            print(f"  {path}: {os.path.getsize(path) / 1024:.0f} KB")
+        print(f"[OK] Packed edges exported")
 
-        print(f"[OK] Web data exported successfully")
+    def export_binary(self, output_file):
+        """Export chapters, edges and the book matrix as a memory-mappable bundle"""
+        print(f"Exporting binary graph data to {output_file}...")
 
-    def export_stats(self, output_file):
-        """Export statistical summary"""
-        print(f"Generating statistics...")
+        chapter_book = np.repeat(np.arange(TOTAL_BOOKS, dtype=np.int16), BOOK_CHAPTER_COUNTS)
+        chapter_number = (np.arange(TOTAL_CHAPTERS) - BOOK_CHAPTER_OFFSETS[chapter_book] + 1).astype(np.int16)
+
+        arrays = {
+            'chapter_book_index': chapter_book,
+            'chapter_number': chapter_number,
+            'edge_source': self.chapter_edges.source.astype(np.int32),
+            'edge_target': self.chapter_edges.target.astype(np.int32),
+            'edge_weight': compact_int_array(self.chapter_edges.weight),
+            'book_matrix': compact_int_array(self.book_refs)
+        }
+
+        # CSR offsets; outgoing neighbors are slices of edge_target
+        csr = self.chapter_csr or self.build_chapter_csr()
+        arrays['out_indptr'] = csr['out_indptr']
+        arrays['in_indptr'] = csr['in_indptr']
+        arrays['in_edges'] = csr['in_edges']
+
+        # Top N edges and per-chapter top-K lists are slices, no sorting
+        rankings = self.edge_rankings or self.build_edge_rankings()
+        arrays['weight_order'] = rankings['weight_order']
+        arrays['top_indptr'] = rankings['top_indptr']
+        arrays['top_edges'] = rankings['top_edges']
+
+        # Book-pair buckets: edges from book A to book B are one slice
+        pairs = self.book_pairs or self.build_book_pair_index()
+        arrays['book_pair_order'] = pairs['order']
+        arrays['book_pair_offsets'] = pairs['offsets']
+
+        # Vote totals and net-vote threshold layers (prefixes of net_order)
+        layers = self.vote_layers or self.build_vote_layers()
+        arrays['edge_positive'] = compact_int_array(self.edge_votes.positive)
+        arrays['edge_negative'] = compact_int_array(self.edge_votes.negative)
+        arrays['net_order'] = layers['net_order']
+        arrays['net_sorted'] = compact_int_array(layers['net_sorted'])
+        metadata = {
+            'total_books': TOTAL_BOOKS,
+            'total_chapters': TOTAL_CHAPTERS,
+            'total_connections': len(self.chapter_edges.source),
+            'total_verse_refs': self.total_verse_refs,
+            'top_k': rankings['top_k'],
+            'vote_thresholds': layers['thresholds'].tolist(),
+            'vote_layer_counts': layers['layer_counts'].tolist(),
+            'books': BIBLE_BOOKS
+        }
+
+        write_bundle(output_file, arrays, metadata)
+        print(f"[OK] Binary graph data exported")
+
+    def export_verse_index(self, output_file):
+        """Export the verse-level index as a memory-mappable bundle"""
+        print(f"Exporting verse index to {output_file}...")
+
+        index = self.verse_index or self.build_verse_index()
+        metadata = {
+            'verse_id_encoding': 'BBCCCVVV: book_number * 1000000 + chapter * 1000 + verse (book_number 1-66)',
+            'books': [{'name': b['name'], 'abbrev': b['abbrev']} for b in BIBLE_BOOKS],
+            'total_verses': len(index['verse_ids']),
+            'total_refs': len(index['target_ids'])
+        }
+
+        write_bundle(output_file, index, metadata)
+        print(f"[OK] Verse index exported")
 
-        # Top referenced books
-        book_in_refs = defaultdict(int)
-        book_out_refs = defaultdict(int)
+    def build_stats(self):
+        """Statistical summary, including every key the desktop StatsView reads
 
-        for ref in self.verse_refs:
-            book_out_refs[ref['from']['book']] += 1
-            book_in_refs[ref['to']['book']] += 1
+        Verse-level figures come from the single counting pass; chapter-level
+        figures are bincounts over the edge arrays.
+        """
+        counts = self.collect_counts()
+        book_in_refs = counts['book_in']
+        book_out_refs = counts['book_out']
+        testament_counts = counts['testament']
+        source, target, weight = self.chapter_edges
 
-        top_in = sorted(book_in_refs.items(), key=lambda x: x[1], reverse=True)[:10]
-        top_out = sorted(book_out_refs.items(), key=lambda x: x[1], reverse=True)[:10]
+        def top_books(counts):
+            order = np.argsort(-counts, kind='stable')[:10]
+            return [{'book': BIBLE_BOOKS[i]['name'], 'count': int(counts[i])}
+                    for i in order if counts[i] > 0]
 
-        stats = {
-            'total_verse_references': len(self.verse_refs),
-            'total_chapter_connections': len(self.chapter_refs),
-            'most_referenced_books': [{'book': b, 'count': c} for b, c in top_in],
-            'most_referencing_books': [{'book': b, 'count': c} for b, c in top_out],
+        # Chapter degree: edges touching the chapter, in either direction
+        chapter_degree = (np.bincount(source, minlength=TOTAL_CHAPTERS) +
+                          np.bincount(target, minlength=TOTAL_CHAPTERS))
+        chapter_book = np.repeat(np.arange(TOTAL_BOOKS), BOOK_CHAPTER_COUNTS)
+        book_degree = np.bincount(chapter_book, weights=chapter_degree, minlength=TOTAL_BOOKS).astype(np.int64)
+        chapter_labels = [node['label'] for node in build_chapter_nodes()]
+
+        top_book_order = np.argsort(-book_degree, kind='stable')[:10]
+        top_chapter_order = np.argsort(-chapter_degree, kind='stable')[:10]
+
+        # 0 = OT-OT, 1 = cross-testament, 2 = NT-NT
+        edge_testament = np.bincount(
+            BOOK_IS_NT[chapter_book[source]].astype(np.intp) + BOOK_IS_NT[chapter_book[target]],
+            minlength=3
+        )
+        weight_values, weight_counts = np.unique(weight, return_counts=True)
+
+        return {
+            'total_verse_references': self.total_verse_refs,
+            'total_chapter_connections': len(source),
+            'most_referenced_books': top_books(book_in_refs),
+            'most_referencing_books': top_books(book_out_refs),
             'testament_distribution': {
-                'OT_to_OT': sum(1 for r in self.verse_refs if r['from']['testament'] == 'OT' and r['to']['testament'] == 'OT'),
-                'OT_to_NT': sum(1 for r in self.verse_refs if r['from']['testament'] == 'OT' and r['to']['testament'] == 'NT'),
-                'NT_to_OT': sum(1 for r in self.verse_refs if r['from']['testament'] == 'NT' and r['to']['testament'] == 'OT'),
-                'NT_to_NT': sum(1 for r in self.verse_refs if r['from']['testament'] == 'NT' and r['to']['testament'] == 'NT')
+                key: int(testament_counts[i])
+                for i, key in enumerate(('OT_to_OT', 'OT_to_NT', 'NT_to_OT', 'NT_to_NT'))
+            },
+            'total_connections': len(source),
+            'total_chapters': TOTAL_CHAPTERS,
+            'avg_connections_per_chapter': round(float(chapter_degree.mean()), 1),
+            'top_books': [{'book': BIBLE_BOOKS[i]['name'], 'connections': int(book_degree[i])}
+                          for i in top_book_order],
+            'top_chapters': [{'chapter': chapter_labels[i], 'connections': int(chapter_degree[i])}
+                             for i in top_chapter_order],
+            'testament_stats': {
+                'OT-OT': int(edge_testament[0]),
+                'NT-NT': int(edge_testament[2]),
+                'cross_testament': int(edge_testament[1])
+            },
+            'weight_distribution': {
+                str(w): int(c) for w, c in zip(weight_values.tolist(), weight_counts.tolist())
             }
         }
 
+    def export_stats(self, output_file):
+        """Export statistical summary"""
+        print(f"Generating statistics...")
+
+        stats = self.build_stats()
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(stats, f, indent=2)
 
         print(f"[OK] Statistics exported")
 
-def main():
+def run_stage(name, action, profile=False, trace_memory=False, top=15):
+    """Run one pipeline stage, optionally under cProfile and/or tracemalloc
+
+    Returns whatever the action returns (the paths it wrote).
+    """
+    print(f"\n== {name} ==")
+    profiler = cProfile.Profile() if profile else None
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        result = action()
+    finally:
+        if profiler:
+            profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    print(f"[OK] {name} finished in {elapsed:.2f}s")
+
+    if trace_memory:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  Memory: peak {peak / 1024 / 1024:.1f} MB, still allocated {current / 1024 / 1024:.1f} MB")
+        for stat in snapshot.statistics('lineno')[:top]:
+            print(f"    {stat}")
+
+    if profiler:
+        print(f"  Hot spots (top {top} by own time):")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats('tottime').print_stats(top)
+
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Convert cross_references.txt into visualization-ready formats')
+    parser.add_argument('stages', nargs='*', metavar='stage',
+                        help=f"stages to run, in pipeline order: {', '.join(PIPELINE_STAGES)} "
+                             "(default: all)")
+    parser.add_argument('--input', default='../cross_references.txt',
+                        help='cross-reference file (default: ../cross_references.txt)')
+    parser.add_argument('--output-dir', default='processed',
+                        help='directory for exported files (default: processed)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='directory for stage intermediates (default: <output-dir>/cache)')
+    parser.add_argument('--incremental', action='store_true',
+                        help="parse only the chunks that changed since the previous run")
+    parser.add_argument('--streaming', action='store_true',
+                        help='never hold the verse-level rows in memory')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='parse newline-aligned shards in N processes')
+    parser.add_argument('--columnar', action='store_true',
+                        help='write graph_data.json edges as parallel integer arrays '
+                             '(smaller; data-loader.js expands them)')
+    parser.add_argument('--no-compress', action='store_true',
+                        help='skip the .gz/.br siblings of the web exports')
+    parser.add_argument('--release', action='store_true',
+                        help=f"smallest .gz/.br files (gzip {RELEASE_COMPRESSION.gzip_level}, "
+                             f"brotli {RELEASE_COMPRESSION.brotli_quality}); much slower")
+    parser.add_argument('--gzip-level', type=int, choices=range(1, 10), default=None, metavar='1-9',
+                        help=f"gzip level (default: {FAST_COMPRESSION.gzip_level})")
+    parser.add_argument('--brotli-quality', type=int, choices=range(0, 12), default=None,
+                        metavar='0-11',
+                        help=f"brotli quality (default: {FAST_COMPRESSION.brotli_quality})")
+    parser.add_argument('--profile', action='store_true',
+                        help='run each stage under cProfile and print its hot spots')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='run each stage under tracemalloc and print its peak and top allocations')
+    parser.add_argument('--top', type=int, default=15,
+                        help='lines shown per stage by --profile/--trace-memory (default: 15)')
+
+    args = parser.parse_args(argv)
+    unknown = [stage for stage in args.stages if stage not in PIPELINE_STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    levels = RELEASE_COMPRESSION if args.release else FAST_COMPRESSION
+    args.compression = None if args.no_compress else Compression(
+        gzip_level=args.gzip_level or levels.gzip_level,
+        brotli_quality=levels.brotli_quality if args.brotli_quality is None else args.brotli_quality)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stages = [stage for stage in PIPELINE_STAGES if not args.stages or stage in args.stages]
+    output_dir = args.output_dir
+    cache_dir = args.cache_dir or os.path.join(output_dir, 'cache')
+    counts_cache = os.path.join(cache_dir, 'counts.npz')
+    aggregates_cache = os.path.join(cache_dir, 'aggregates.npz')
+    stamps_file = os.path.join(cache_dir, 'stage_stamps.json')
+
+    def out(name):
+        return os.path.join(output_dir, name)
+
     print("Bible Cross-Reference Data Processor")
     print("=" * 50)
+    print(f"Stages: {', '.join(stages)}")
+    compression = args.compression or False
+    if compression:
+        print(f"Compression: gzip {compression.gzip_level}, brotli {compression.brotli_quality}"
+              + ("" if brotli is not None else " (brotli not installed)"))
+
+    os.makedirs(output_dir, exist_ok=True)
+    processor = BibleDataProcessor(args.input, streaming=args.streaming, workers=args.workers)
+
+    def parse():
+        # --incremental reuses the previous run's chunk counts
+        if args.incremental:
+            processor.load_incremental(out('incremental_cache.npz'))
+        else:
+            processor.load_cross_references()
+        processor.save_counts(counts_cache)
+        return [counts_cache]
+
+    def require_counts():
+        if processor.counts is None and not processor.load_counts(counts_cache):
+            print(f"No cached counts in {cache_dir}, parsing {args.input}")
+            parse()
+
+    def aggregate():
+        require_counts()
+        processor.aggregate_to_chapters()
+        processor.aggregate_to_books()
+        processor.save_aggregates(aggregates_cache)
+        return [aggregates_cache]
+
+    def require_aggregates():
+        if processor.chapter_edges is None and not processor.load_aggregates(aggregates_cache):
+            print(f"No cached aggregates in {cache_dir}, aggregating")
+            aggregate()
+
+    def export_web():
+        require_aggregates()
+        processor.export_for_web(out('graph_data.json'), columnar=args.columnar,
+                                 compress=compression)
+        processor.export_packed_edges(out('graph_edges.bin'), compress=compression)
+        processor.export_chapter_csr(out('chapter_csr.json'), compress=compression)
+        processor.export_edge_rankings(out('edge_rankings.json'), compress=compression)
+        processor.export_vote_layers(out('vote_layers.json'), compress=compression)
+        processor.export_book_pair_index(out('book_pairs.json'), compress=compression)
+        processor.export_shards(output_dir, chapters=changed_shards())
+        return [out(name) for name in ('graph_data.json', 'graph_edges.bin', 'chapter_csr.json',
+                                       'edge_rankings.json', 'vote_layers.json', 'book_pairs.json',
+                                       'manifest.json')]
+
+    def changed_shards():
+        """Chapters whose shards need rewriting, or None for all of them
+
+        After an incremental parse only the touched chapters' shards
+        change, provided the shards on disk were written for the input
+        the incremental cache last saw.
+        """
+        previous = stamps.get('export-web')
+        if (processor.changed_chapters is None or previous is None
+                or previous['input'] != processor.previous_input
+                or previous['compression'] != stamp['compression']
+                or not all(os.path.exists(path) for path in previous['paths'])):
+            return None
+        return processor.changed_chapters
+
+    def export_stats():
+        require_aggregates()
+        require_counts()
+        processor.export_stats(out('stats.json'))
+        return [out('stats.json')]
+
+    def export_binary():
+        require_aggregates()
+        processor.export_binary(out('graph_data.bin'))
+        # The verse index needs the rows themselves; re-read unless loaded
+        if processor.verse_refs is None and not os.path.exists(args.input):
+            print(f"[WARN] {args.input} not found, skipping verse_index.bin")
+            return [out('graph_data.bin')]
+        processor.export_verse_index(out('verse_index.bin'))
+        return [out('graph_data.bin'), out('verse_index.bin')]
+
+    def export_sections():
+        if processor.verse_refs is None and not os.path.exists(args.input):
+            print(f"[WARN] {args.input} not found, skipping section_index.json")
+            return []
+        processor.export_section_index(out('section_index.json'), compress=compression)
+        return [out('section_index.json')]
+
+    def export_lod():
+        require_aggregates()
+        if processor.verse_refs is None and not os.path.exists(args.input):
+            print(f"[WARN] {args.input} not found, skipping lod_pyramid.bin")
+            return []
+        processor.export_lod_pyramid(out('lod_pyramid.bin'))
+        return [out('lod_pyramid.bin')]
+
+    def export_metrics():
+        require_aggregates()
+        if graph_metrics is None:
+            print("[WARN] SciPy not installed, skipping graph_metrics.bin")
+            return []
+        processor.export_graph_metrics(out('graph_metrics.bin'), out('graph_metrics.json'),
+                                       compress=compression)
+        return [out('graph_metrics.bin'), out('graph_metrics.json')]
+
+    def export_layout():
+        require_aggregates()
+        processor.export_layouts(out('graph_layout.bin'), out('graph_layout.json'),
+                                 compress=compression)
+        return [out('graph_layout.bin'), out('graph_layout.json')]
+
+    actions = {
+        'parse': parse,
+        'aggregate': aggregate,
+        'export-web': export_web,
+        'export-stats': export_stats,
+        'export-binary': export_binary,
+        'export-sections': export_sections,
+        'export-lod': export_lod,
+        'export-metrics': export_metrics,
+        'export-layout': export_layout
+    }
+    descriptions = {
+        counts_cache: 'cached verse-level counts',
+        aggregates_cache: 'cached chapter edges and book matrix',
+        out('graph_data.json'): 'for web visualizer',
+        out('graph_edges.bin'): 'varint-packed edges, quantized weights',
+        out('chapter_csr.json'): 'per-chapter adjacency slices',
+        out('edge_rankings.json'): 'edges by weight and per-chapter top-K',
+        out('vote_layers.json'): 'positive/negative votes and net-vote threshold layers',
+        out('book_pairs.json'): 'edges bucketed by source/target book pair',
+        out('manifest.json'): 'index of books/*.json and chapters/*.json shards',
+        out('stats.json'): 'statistics',
+        out('graph_data.bin'): 'memory-mappable, for desktop app',
+        out('verse_index.bin'): 'verse-level top-k cross-references',
+        out('section_index.json'): 'section interval tree and per-section reference totals',
+        out('lod_pyramid.bin'): 'book/chapter/section/verse level-of-detail graphs',
+        out('graph_metrics.bin'): 'per-chapter communities and centrality, for desktop app',
+        out('graph_metrics.json'): 'the same metrics for the web',
+        out('graph_layout.bin'): '2D/3D chapter positions, for desktop app',
+        out('graph_layout.json'): 'the same positions for the web'
+    }
 
-    processor = BibleDataProcessor('../cross_references.txt')
+    # Every stage after parse records the input it ran on; with --incremental
+    # a stage whose input, settings and outputs are unchanged is not rerun
+    stamps = load_stage_stamps(stamps_file)
+    stamp = {'input': input_fingerprint(args.input),
+             'compression': list(compression) if compression else None,
+             'columnar': args.columnar}
 
-    # Process data
-    processor.load_cross_references()
-    processor.aggregate_to_chapters()
-    processor.aggregate_to_books()
+    def reusable(stage):
+        previous = stamps.get(stage)
+        return (args.incremental and stage != 'parse' and stamp['input'] is not None
+                and previous is not None
+                and all(previous.get(key) == value for key, value in stamp.items())
+                and all(os.path.exists(path) for path in previous['paths']))
 
-    # Export
-    processor.export_for_web('processed/graph_data.json')
-    processor.export_stats('processed/stats.json')
+    # Each action returns the paths it actually wrote; skipped outputs are not listed
+    generated = []
+    for stage in stages:
+        if reusable(stage):
+            print(f"\n== {stage} ==")
+            print(f"[OK] Input unchanged since {stage} last ran, keeping its outputs")
+            generated += stamps[stage]['paths']
+            continue
+        paths = run_stage(stage, actions[stage], profile=args.profile,
+                          trace_memory=args.trace_memory, top=args.top)
+        generated += paths
+        stamps[stage] = {**stamp, 'paths': paths}
+        save_stage_stamps(stamps_file, stamps)
 
     print("\n[OK] All data processing complete!")
     print("\nGenerated files:")
-    print("  - processed/graph_data.json  (for web visualizer)")
-    print("  - processed/stats.json       (statistics)")
+    for path in generated:
+        print(f"  - {path}  ({descriptions[path]})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Binary Array Bundle Format
+Named NumPy arrays in one file that can be memory-mapped without parsing
+
+Layout (all integers little-endian):
+    bytes 0-7     magic b'BXGRAPH\\0'
+    bytes 8-11    uint32 format version
+    bytes 12-15   uint32 length N of the JSON header
+    bytes 16-     N bytes of UTF-8 JSON:
+                  {"metadata": {...},
+                   "arrays": {name: {"dtype": "<i4", "shape": [...], "offset": n}}}
+    data section  starts at the first 64-byte boundary after the header;
+                  each array is raw C-order data at data_start + offset,
+                  itself aligned to 64 bytes
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'BXGRAPH\0'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+PREAMBLE = struct.Struct('<8sII')
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_bundle(path, arrays, metadata=None):
+    """Write named arrays (stored little-endian) plus JSON metadata to path"""
+    prepared = {}
+    layout = {}
+    offset = 0
+
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        array = array.astype(array.dtype.newbyteorder('<'), copy=False)
+        prepared[name] = array
+        layout[name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset
+        }
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({'metadata': metadata or {}, 'arrays': layout},
+                        separators=(',', ':')).encode('utf-8')
+    data_start = _align(PREAMBLE.size + len(header))
+
+    # Write under a temporary name so readers never see a partial file
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, array in prepared.items():
+            f.seek(data_start + layout[name]['offset'])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(temp_path, path)
+
+
+def read_header(buffer):
+    """Parse the preamble and JSON header; returns (header dict, data start)"""
+    magic, version, header_length = PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError('Not a binary graph bundle')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported bundle version {version}')
+
+    header_end = PREAMBLE.size + header_length
+    header = json.loads(bytes(buffer[PREAMBLE.size:header_end]).decode('utf-8'))
+    return header, _align(header_end)
+
+
+def open_bundle(path):
+    """Memory-map a bundle; returns (arrays dict, metadata dict)
+
+    The arrays are read-only views into the mapping, so opening costs
+    the same regardless of how many edges the file holds.
+    """
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    header, data_start = read_header(buffer)
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=data_start + spec['offset']).reshape(spec['shape'])
+    return arrays, header['metadata']
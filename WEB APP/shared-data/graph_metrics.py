@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Chapter Graph Metrics
+Community detection and centrality over the weighted chapter graph
+
+Everything runs on a SciPy sparse adjacency matrix (A[i, j] = weight of
+the edge from chapter i to chapter j) and returns one array per metric,
+indexed by chapter id, so the desktop and web views can colour and size
+nodes without running graph algorithms themselves.
+
+Louvain communities come from python-louvain when it is installed and
+from networkx otherwise (both are desktop app dependencies); without
+networkx, communities are skipped.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    import community as community_louvain  # python-louvain
+except ImportError:
+    community_louvain = None
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+PAGERANK_DAMPING = 0.85
+BETWEENNESS_SAMPLES = 256
+BETWEENNESS_BATCH = 128
+
+
+def adjacency(source, target, weight, total_nodes):
+    """Weighted directed adjacency matrix in CSR form"""
+    return sp.csr_matrix((np.asarray(weight, dtype=np.float64), (source, target)),
+                         shape=(total_nodes, total_nodes))
+
+
+def structure(matrix):
+    """Unweighted copy: 1.0 for every stored edge, zero-weight edges included"""
+    binary = matrix.copy()
+    binary.data = np.ones_like(binary.data)
+    return binary
+
+
+def weighted_degree(matrix):
+    """(out strength, in strength, out degree, in degree) per node"""
+    binary = structure(matrix)
+    return (np.asarray(matrix.sum(axis=1)).ravel(),
+            np.asarray(matrix.sum(axis=0)).ravel(),
+            np.asarray(binary.sum(axis=1)).ravel(),
+            np.asarray(binary.sum(axis=0)).ravel())
+
+
+def pagerank(matrix, damping=PAGERANK_DAMPING, tol=1e-10, max_iter=200):
+    """Weighted PageRank by power iteration
+
+    Each node passes rank along its out-edges in proportion to their
+    weight; nodes without out-edges spread theirs evenly, as networkx does.
+    """
+    n = matrix.shape[0]
+    out_strength = np.asarray(matrix.sum(axis=1)).ravel()
+    dangling = out_strength == 0
+    inverse = np.divide(1.0, out_strength, out=np.zeros(n), where=~dangling)
+    transition_t = (sp.diags(inverse) @ matrix).T.tocsr()
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = damping * (transition_t @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        converged = np.abs(updated - rank).sum() < n * tol
+        rank = updated
+        if converged:
+            break
+    return rank / rank.sum()
+
+
+def betweenness(matrix, samples=BETWEENNESS_SAMPLES, seed=0, batch=BETWEENNESS_BATCH):
+    """Approximate betweenness centrality (hop-count shortest paths, directed)
+
+    Brandes' algorithm from `samples` random source nodes, run for a batch
+    of sources at once as sparse matrix products: each BFS level is one
+    A.T @ frontier step that also counts shortest paths, and dependencies
+    are accumulated back up the levels the same way. The sum is scaled by
+    n / samples and normalized like networkx (1 / ((n - 1)(n - 2))), so
+    samples >= n gives the exact value.
+    """
+    n = matrix.shape[0]
+    forward = structure(matrix)
+    backward = forward.T.tocsr()
+
+    if samples is None or samples >= n:
+        sources = np.arange(n)
+    else:
+        sources = np.sort(np.random.default_rng(seed).choice(n, size=samples, replace=False))
+
+    totals = np.zeros(n)
+    for start in range(0, len(sources), batch):
+        batch_sources = sources[start:start + batch]
+        columns = np.arange(len(batch_sources))
+
+        sigma = np.zeros((n, len(batch_sources)))
+        sigma[batch_sources, columns] = 1.0
+        seen = sigma > 0
+        frontier = sigma.copy()
+        levels = []
+        while frontier.any():
+            levels.append(frontier > 0)
+            frontier = backward @ frontier
+            frontier[seen] = 0.0
+            seen |= frontier > 0
+            sigma += frontier
+
+        delta = np.zeros_like(sigma)
+        safe_sigma = np.where(sigma > 0, sigma, 1.0)
+        for depth in range(len(levels) - 1, 0, -1):
+            share = np.where(levels[depth], (1.0 + delta) / safe_sigma, 0.0)
+            delta += np.where(levels[depth - 1], sigma * (forward @ share), 0.0)
+
+        delta[batch_sources, columns] = 0.0
+        totals += delta.sum(axis=1)
+
+    scale = n / len(sources)
+    if n > 2:
+        scale /= (n - 1) * (n - 2)
+    return totals * scale
+
+
+def louvain_communities(matrix, seed=0, resolution=1.0):
+    """Community id per node, largest community first
+
+    Louvain works on the undirected graph, so A and A.T are summed and
+    self-loops dropped. Returns (labels, modularity), or (None, None)
+    without networkx.
+    """
+    if nx is None:
+        # python-louvain builds on networkx graphs as well
+        return None, None
+
+    n = matrix.shape[0]
+    upper = sp.triu(matrix + matrix.T, k=1).tocoo()
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    graph.add_weighted_edges_from(zip(upper.row.tolist(), upper.col.tolist(), upper.data.tolist()))
+
+    if community_louvain is not None:
+        partition = community_louvain.best_partition(graph, weight='weight', resolution=resolution,
+                                                     random_state=seed)
+        groups = {}
+        for node, label in partition.items():
+            groups.setdefault(label, []).append(node)
+        communities = list(groups.values())
+    else:
+        communities = [sorted(c) for c in nx.community.louvain_communities(
+            graph, weight='weight', resolution=resolution, seed=seed)]
+
+    # Stable ids: by size descending, then by first member
+    communities.sort(key=lambda members: (-len(members), min(members)))
+    labels = np.full(n, -1, dtype=np.int32)
+    for label, members in enumerate(communities):
+        labels[members] = label
+
+    modularity = nx.community.modularity(graph, communities, weight='weight', resolution=resolution)
+    return labels, float(modularity)
+
+
+def compute_metrics(source, target, weight, total_nodes, betweenness_samples=BETWEENNESS_SAMPLES,
+                    seed=0):
+    """All per-node metrics as a dict of arrays, plus summary metadata"""
+    matrix = adjacency(source, target, weight, total_nodes)
+    out_strength, in_strength, out_degree, in_degree = weighted_degree(matrix)
+
+    metrics = {
+        'out_strength': out_strength.astype(np.int64),
+        'in_strength': in_strength.astype(np.int64),
+        'out_degree': out_degree.astype(np.int32),
+        'in_degree': in_degree.astype(np.int32),
+        'pagerank': pagerank(matrix),
+        'betweenness': betweenness(matrix, samples=betweenness_samples, seed=seed)
+    }
+    summary = {
+        'pagerank_damping': PAGERANK_DAMPING,
+        'betweenness_samples': min(betweenness_samples or total_nodes, total_nodes),
+        'seed': seed
+    }
+
+    labels, modularity = louvain_communities(matrix, seed=seed)
+    if labels is not None:
+        metrics['community'] = labels
+        summary['communities'] = int(labels.max()) + 1
+        summary['modularity'] = round(modularity, 6)
+        summary['community_method'] = 'python-louvain' if community_louvain is not None else 'networkx'
+    return metrics, summary
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Packed Edge Format
+Chapter edges as delta-encoded varints plus quantized weights, for the web
+
+Layout (all integers little-endian):
+    bytes 0-7     magic b'BXEDGES\\0'
+    bytes 8-11    uint32 format version
+    bytes 12-15   uint32 length N of the JSON header
+    bytes 16-     N bytes of UTF-8 JSON:
+                  {"metadata": {...}, "books": [...], "book_matrix": [[...]],
+                   "edges": {"count": E, "nodes": C,
+                             "keys_offset": o, "keys_bytes": n,
+                             "weights_offset": o, "weight_dtype": "uint8"|"uint16",
+                             "weight_scale": s}}
+    keys          at keys_offset (from the start of the file): E unsigned
+                  LEB128 varints. Edge i has key source * C + target; edges
+                  are sorted by key, and the stream holds key[0] followed by
+                  key[i] - key[i - 1], so most edges take one or two bytes
+    weights       at weights_offset (4-byte aligned): E uint8/uint16 values;
+                  weight = value * weight_scale, rounded half up
+
+With the default weight_dtype the smallest lossless type is used
+(weight_scale 1). The reference decoder below is deliberately plain
+Python; js/data-loader.js (decodePackedEdges) mirrors it step for step.
+"""
+
+import gzip
+import json
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'BXEDGES\0'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<8sII')
+WEIGHT_DTYPES = {'uint8': np.uint8, 'uint16': np.uint16}
+
+
+def _align4(offset):
+    return (offset + 3) // 4 * 4
+
+
+def encode_varints(values):
+    """Unsigned LEB128: 7 bits per byte, high bit set on all but the last byte"""
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        lengths += values >= np.uint64(1 << shift)
+
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    starts = np.cumsum(lengths) - lengths
+    for k in range(int(lengths.max(initial=0))):
+        rows = lengths > k
+        low = (values[rows] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[rows] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[rows] + k] = low | more
+    return out.tobytes()
+
+
+def quantize_weights(weight, weight_dtype=None):
+    """(quantized array, dtype name, scale); weight ~= quantized * scale
+
+    weight_dtype None picks uint8 or uint16, whichever holds every weight
+    exactly; a type too small for the largest weight gets a scale > 1.
+    Scaled weights are rounded half up, like the decoders (not np.rint,
+    which rounds half to even).
+    """
+    weight = np.asarray(weight, dtype=np.int64)
+    largest = int(weight.max(initial=0))
+    if weight_dtype is None:
+        weight_dtype = 'uint8' if largest <= np.iinfo(np.uint8).max else 'uint16'
+
+    dtype = WEIGHT_DTYPES[weight_dtype]
+    scale = max(1.0, largest / np.iinfo(dtype).max)
+    quantized = np.floor(weight / scale + 0.5).astype(dtype) if scale > 1 else weight.astype(dtype)
+    return quantized, weight_dtype, scale
+
+
+def write_packed_edges(path, source, target, weight, total_nodes, header=None,
+                       weight_dtype=None, compress=True, gzip_level=None):
+    """Write edges (sorted by source, then target) to path
+
+    header holds extra JSON fields (metadata, books, ...). compress=True
+    also writes a .gz sibling, at gzip_level (default 9). Returns the
+    paths written.
+    """
+    keys = np.asarray(source, dtype=np.int64) * total_nodes + np.asarray(target, dtype=np.int64)
+    deltas = np.diff(keys, prepend=0)
+    if len(deltas) and deltas[1:].min(initial=1) <= 0:
+        raise ValueError('Edges must be unique and sorted by source, then target')
+
+    key_bytes = encode_varints(deltas)
+    quantized, dtype_name, scale = quantize_weights(weight, weight_dtype)
+
+    # The offsets depend on the header length, which depends on the offsets
+    edges = {'count': len(keys), 'nodes': int(total_nodes), 'keys_offset': 0,
+             'keys_bytes': len(key_bytes), 'weights_offset': 0,
+             'weight_dtype': dtype_name, 'weight_scale': scale}
+    while True:
+        encoded = json.dumps({**(header or {}), 'edges': edges},
+                             separators=(',', ':')).encode('utf-8')
+        keys_offset = PREAMBLE.size + len(encoded)
+        weights_offset = _align4(keys_offset + len(key_bytes))
+        if (edges['keys_offset'], edges['weights_offset']) == (keys_offset, weights_offset):
+            break
+        edges['keys_offset'], edges['weights_offset'] = keys_offset, weights_offset
+
+    data = b''.join((
+        PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)),
+        encoded,
+        key_bytes,
+        b'\0' * (weights_offset - keys_offset - len(key_bytes)),
+        quantized.astype(quantized.dtype.newbyteorder('<')).tobytes()
+    ))
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    paths = [path]
+
+    if compress:
+        # mtime=0 keeps the .gz byte-identical across rebuilds
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=gzip_level or 9, mtime=0))
+        paths.append(path + '.gz')
+    return paths
+
+
+def decode_packed_edges(data):
+    """Reference decoder: bytes -> (header, source, target, weight lists)"""
+    magic, version, header_length = PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError('Not a packed edge file')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Unsupported packed edge version {version}')
+
+    header = json.loads(data[PREAMBLE.size:PREAMBLE.size + header_length].decode('utf-8'))
+    edges = header['edges']
+    count, nodes = edges['count'], edges['nodes']
+
+    source, target = [], []
+    pos = edges['keys_offset']
+    key = 0
+    for _ in range(count):
+        delta = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            delta |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        key += delta
+        source.append(key // nodes)
+        target.append(key % nodes)
+
+    code = 'B' if edges['weight_dtype'] == 'uint8' else 'H'
+    raw = struct.unpack_from(f'<{count}{code}', data, edges['weights_offset'])
+    scale = edges['weight_scale']
+    # Round half up, as Math.round does in the JS decoder
+    weight = list(raw) if scale == 1 else [int(value * scale + 0.5) for value in raw]
+    return header, source, target, weight
+
+
+def read_packed_edges(path):
+    """Decode a packed edge file (or its .gz sibling)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return decode_packed_edges(f.read())
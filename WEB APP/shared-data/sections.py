@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Bible Section (Pericope) Data
+Parses data/bible-section-counts.txt: section ranges used by 20 translations
+
+Each line is start verse, end verse, verse after the end, and how many
+translations start a section there (OSIS refs such as Gen.1.1). Verses are
+converted to canonical BBCCCVVV ids, the same encoding data_processor.py uses.
+
+SectionIndex answers "which sections contain verse X / overlap range Y"
+with a static interval tree, and round-trips through the compact
+processed/section_index.json shared with the reader and the Sankey view.
+"""
+
+import os
+
+import numpy as np
+
+SECTION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data',
+                            'bible-section-counts.txt')
+TOTAL_TRANSLATIONS = 20
+# A section boundary used by at least half of the translations
+DEFAULT_MIN_AGREEMENT = 10
+
+
+def osis_to_verse_id(ref, book_numbers):
+    """'Gen.1.1' -> 1001001 (book number is 1-based)"""
+    book, chapter, verse = ref.strip().split('.')
+    return book_numbers[book] * 1000000 + int(chapter) * 1000 + int(verse)
+
+
+def load_sections(path, book_abbrevs):
+    """Section rows as parallel arrays (start, end, next, count), in file order
+
+    book_abbrevs is the canonical book order; its abbreviations must match
+    the OSIS book names in the file.
+    """
+    book_numbers = {abbrev: i + 1 for i, abbrev in enumerate(book_abbrevs)}
+    start, end, after, count = [], [], [], []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            parts = line.rstrip('\n').split('\t')
+            start.append(osis_to_verse_id(parts[0], book_numbers))
+            end.append(osis_to_verse_id(parts[1], book_numbers))
+            after.append(osis_to_verse_id(parts[2], book_numbers))
+            count.append(int(parts[3]))
+
+    return {
+        'start': np.array(start, dtype=np.int32),
+        'end': np.array(end, dtype=np.int32),
+        'next': np.array(after, dtype=np.int32),
+        'count': np.array(count, dtype=np.int16)
+    }
+
+
+def all_verse_ids(sections):
+    """Every verse id covered by the sections, in canonical order
+
+    The section ranges tile each book, so the highest verse seen in a
+    chapter is that chapter's verse count.
+    """
+    ids = np.concatenate((sections['start'], sections['end']))
+    chapters, inverse = np.unique(ids // 1000, return_inverse=True)
+    verse_counts = np.zeros(len(chapters), dtype=np.int32)
+    np.maximum.at(verse_counts, inverse, ids % 1000)
+
+    chapter_ids = np.repeat(chapters, verse_counts)
+    first = np.repeat(np.cumsum(verse_counts) - verse_counts, verse_counts)
+    return (chapter_ids * 1000 + np.arange(len(chapter_ids)) - first + 1).astype(np.int32)
+
+
+def partition_sections(sections, verse_ids, min_agreement=DEFAULT_MIN_AGREEMENT):
+    """Non-overlapping sections: (start ids, end ids), canonical order
+
+    Starts are the boundaries used by at least min_agreement translations,
+    plus the first verse of every chapter, so a section never spans a
+    chapter break.
+    """
+    agreed = sections['start'][sections['count'] >= min_agreement]
+    chapter_starts = verse_ids[verse_ids % 1000 == 1]
+    starts = np.union1d(agreed, chapter_starts).astype(np.int32)
+    starts = starts[np.isin(starts, verse_ids)]
+
+    start_rows = np.searchsorted(verse_ids, starts)
+    end_rows = np.append(start_rows[1:], len(verse_ids)) - 1
+    return starts, verse_ids[end_rows]
+
+
+class SectionIndex:
+    """Static interval tree over section verse ranges
+
+    Sections are sorted by (start, end). The tree is implicit: the middle
+    row of every sorted range is that subtree's root, and max_end[i] is
+    the largest end verse in the subtree rooted at row i, so a query
+    skips subtrees that end before it or start after it.
+    """
+
+    def __init__(self, sections):
+        order = np.lexsort((sections['end'], sections['start']))
+        self.sections = {key: values[order] for key, values in sections.items()}
+        self.start = self.sections['start']
+        self.end = self.sections['end']
+        self.count = self.sections['count']
+        self._starts = self.start.tolist()
+        self._ends = self.end.tolist()
+        self.max_end = self._build_max_end()
+        self.reference_totals = None
+
+    @classmethod
+    def from_file(cls, path, book_abbrevs):
+        return cls(load_sections(path, book_abbrevs))
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _build_max_end(self):
+        max_end = list(self._ends)
+
+        def build(lo, hi):
+            if lo >= hi:
+                return -1
+            mid = (lo + hi) // 2
+            max_end[mid] = max(max_end[mid], build(lo, mid), build(mid + 1, hi))
+            return max_end[mid]
+
+        build(0, len(max_end))
+        return max_end
+
+    def overlapping(self, first, last):
+        """Rows of the sections sharing at least one verse with [first, last]"""
+        starts, ends, max_end = self._starts, self._ends, self.max_end
+        hits = []
+        stack = [(0, len(starts))]
+
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if max_end[mid] < first:
+                continue
+            stack.append((lo, mid))
+            if starts[mid] <= last:
+                if ends[mid] >= first:
+                    hits.append(mid)
+                stack.append((mid + 1, hi))
+
+        hits.sort()
+        return np.array(hits, dtype=np.int64)
+
+    def containing(self, verse_id):
+        """Rows of the sections whose range includes verse_id"""
+        return self.overlapping(verse_id, verse_id)
+
+    def count_references(self, verse_ids, from_ids, to_ids, votes):
+        """Cross-reference totals per section, via prefix sums over verse order
+
+        verse_ids is the canonical verse list; references to verses outside
+        it are ignored. Sets and returns reference_totals with per-section
+        out/in reference counts and summed absolute votes.
+        """
+        weight = np.abs(votes.astype(np.int64))
+        section_first = np.searchsorted(verse_ids, self.start)
+        section_last = np.searchsorted(verse_ids, self.end, side='right')
+
+        def range_sums(ids, values):
+            pos = np.searchsorted(verse_ids, ids).clip(max=len(verse_ids) - 1)
+            known = verse_ids[pos] == ids
+            per_verse = np.bincount(pos[known], weights=values[known], minlength=len(verse_ids))
+            prefix = np.concatenate(([0], np.cumsum(per_verse)))
+            return (prefix[section_last] - prefix[section_first]).astype(np.int64)
+
+        ones = np.ones(len(from_ids), dtype=np.int64)
+        self.reference_totals = {
+            'out_refs': range_sums(from_ids, ones),
+            'in_refs': range_sums(to_ids, ones),
+            'out_weight': range_sums(from_ids, weight),
+            'in_weight': range_sums(to_ids, weight)
+        }
+        return self.reference_totals
+
+    def to_dict(self, books, min_agreement=DEFAULT_MIN_AGREEMENT):
+        """Compact, JSON-ready form (books: canonical list of {name, abbrev})"""
+        verse_ids = all_verse_ids(self.sections)
+        partition_start, partition_end = partition_sections(self.sections, verse_ids, min_agreement)
+        book_rows = np.searchsorted(self.start, (np.arange(len(books) + 1) + 1) * 1000000)
+
+        data = {
+            'verse_id_encoding': 'BBCCCVVV: book_number * 1000000 + chapter * 1000 + verse (book_number 1-66)',
+            'books': [{'name': b['name'], 'abbrev': b['abbrev']} for b in books],
+            'total_translations': TOTAL_TRANSLATIONS,
+            'sections': {key: values.tolist() for key, values in self.sections.items()},
+            'book_rows': book_rows.tolist(),
+            'tree_max_end': self.max_end,
+            'partition': {
+                'min_agreement': min_agreement,
+                'start': partition_start.tolist(),
+                'end': partition_end.tolist()
+            }
+        }
+        if self.reference_totals is not None:
+            data['references'] = {key: values.tolist() for key, values in self.reference_totals.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild an index from to_dict() output (e.g. section_index.json)"""
+        columns = data['sections']
+        index = cls({
+            'start': np.array(columns['start'], dtype=np.int32),
+            'end': np.array(columns['end'], dtype=np.int32),
+            'next': np.array(columns['next'], dtype=np.int32),
+            'count': np.array(columns['count'], dtype=np.int16)
+        })
+        if 'references' in data:
+            index.reference_totals = {key: np.array(values, dtype=np.int64)
+                                      for key, values in data['references'].items()}
+        return index
+
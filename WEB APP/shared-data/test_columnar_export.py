@@ -0,0 +1,89 @@
+"""
+Test that --columnar graph_data.json loads into the same connections
+
+The pipeline runs export-web twice on a small random input, with and
+without --columnar. The columnar file is then loaded with node through
+BibleDataLoader.normalizeGraphData (js/data-loader.js), as the web app
+does, and must match the per-edge file exactly.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from data_processor import BIBLE_BOOKS, main
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+DATA_LOADER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'js', 'data-loader.js')
+
+# Load data-loader.js the way the page does (a classic script) and expand one file
+NORMALIZE_SCRIPT = """
+const fs = require('fs');
+const vm = require('vm');
+const context = {console, window: {location: {hostname: 'localhost'}}};
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8') + ';this.loader = dataLoader;', context);
+const data = context.loader.normalizeGraphData(JSON.parse(fs.readFileSync(process.argv[2], 'utf8')));
+process.stdout.write(JSON.stringify(data.connections));
+"""
+
+
+def random_references(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('From Verse\tTo Verse\tVotes\t#test\n')
+        for _ in range(rows):
+            refs = []
+            for book in rng.choice(BIBLE_BOOKS, 2):
+                chapter = rng.integers(1, book['chapters'] + 1)
+                refs.append(f"{book['abbrev']}.{chapter}.{rng.integers(1, 20)}")
+            f.write(f"{refs[0]}\t{refs[1]}\t{rng.integers(-5, 60)}\n")
+
+
+print("=" * 60)
+print("TESTING COLUMNAR WEB EXPORT")
+print("=" * 60)
+
+failed = False
+with tempfile.TemporaryDirectory() as folder:
+    input_file = os.path.join(folder, 'cross_references.txt')
+    random_references(input_file, 5000)
+
+    outputs = {}
+    for name, flags in (('plain', []), ('columnar', ['--columnar'])):
+        output_dir = os.path.join(folder, name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(['export-web', '--input', input_file, '--output-dir', output_dir,
+                  '--no-compress', *flags])
+        outputs[name] = os.path.join(output_dir, 'graph_data.json')
+
+    with open(outputs['plain'], encoding='utf-8') as f:
+        plain = json.load(f)
+    with open(outputs['columnar'], encoding='utf-8') as f:
+        columnar = json.load(f)
+    ok = 'connections' not in columnar and 'connection_columns' in columnar
+    failed |= not ok
+    print(f"   {'✓' if ok else '✗'} --columnar writes connection_columns, not connections")
+
+    if shutil.which('node') is None:
+        print("   [WARN] node not found, skipping normalizeGraphData check")
+    else:
+        result = subprocess.run(['node', '-e', NORMALIZE_SCRIPT, DATA_LOADER, outputs['columnar']],
+                                capture_output=True, text=True, check=True)
+        connections = json.loads(result.stdout)
+        ok = connections == plain['connections']
+        failed |= not ok
+        print(f"   {'✓' if ok else '✗'} normalizeGraphData expands {len(connections)} columnar "
+              f"connections to match the per-edge export ({len(plain['connections'])})")
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,56 @@
+"""
+Test that packed edges round-trip and round weights half up
+
+A uint8 file with largest weight 510 has weight_scale 2, so odd weights
+quantize to exactly .5 and must go up (np.rint would send 5 / 2 = 2.5
+down to 2). Decoding multiplies back and rounds half up as well.
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from packed_edges import quantize_weights, read_packed_edges, write_packed_edges
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+print("=" * 60)
+print("TESTING PACKED EDGES")
+print("=" * 60)
+
+failed = False
+
+
+def check(ok, message):
+    global failed
+    failed |= not ok
+    print(f"   {'✓' if ok else '✗'} {message}")
+
+
+weight = np.array([1, 5, 7, 255, 510])
+quantized, dtype_name, scale = quantize_weights(weight, 'uint8')
+check(scale == 2.0, f"scale for largest weight 510 in uint8: {scale}")
+check(quantized.tolist() == [1, 3, 4, 128, 255],
+      f"half-way weights round up: {weight.tolist()} -> {quantized.tolist()}")
+
+source = np.array([0, 0, 1, 2, 3])
+target = np.array([1, 4, 2, 0, 3])
+with tempfile.TemporaryDirectory() as folder:
+    path = os.path.join(folder, 'edges.bin')
+    write_packed_edges(path, source, target, weight, 5, {'books': []}, weight_dtype='uint8')
+    for name in (path, path + '.gz'):
+        header, got_source, got_target, got_weight = read_packed_edges(name)
+        check(got_source == source.tolist() and got_target == target.tolist(),
+              f"{os.path.basename(name)}: edges round-trip")
+        check(got_weight == [2, 6, 8, 256, 510],
+              f"{os.path.basename(name)}: weights decode to {got_weight}")
+
+    lossless = os.path.join(folder, 'lossless.bin')
+    write_packed_edges(lossless, source, target, weight, 5, compress=False)
+    check(read_packed_edges(lossless)[3] == weight.tolist(), "default dtype is lossless")
+
+sys.exit(1 if failed else 0)
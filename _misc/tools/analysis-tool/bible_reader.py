@@ -11,9 +11,22 @@ import os
 import sys
 import time
 import random
+from bisect import bisect_right
 from collections import defaultdict
 from colorama import init, Fore, Back, Style
 
+# Outputs of WEB APP/shared-data/data_processor.py, checked after the current directory
+SHARED_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               '..', '..', '..', 'WEB APP', 'shared-data')
+PROCESSED_DIR = os.path.join(SHARED_DATA_DIR, 'processed')
+
+try:
+    import numpy as np  # Optional: memory-maps verse_index.bin from data_processor.py
+    sys.path.insert(0, SHARED_DATA_DIR)
+    from graph_binary import open_bundle
+except ImportError:
+    np = None
+
 # Enable Windows VT100 terminal for better Unicode support
 if sys.platform == 'win32':
     try:
@@ -238,11 +251,60 @@ ASCII_BIBLE = f"""{Colors.CYAN}
         └─────────────────────┘
 {Colors.RESET}"""
 
+VERSE_INDEX_PATHS = ['verse_index.bin', os.path.join(PROCESSED_DIR, 'verse_index.bin')]
+SECTION_INDEX_PATHS = ['section_index.json', os.path.join(PROCESSED_DIR, 'section_index.json')]
+
+
+class VerseIndexRefs:
+    """Read-only {"Genesis 1:1": [{'verse', 'votes'}, ...]} view of verse_index.bin
+
+    Lists are built per lookup from memory-mapped arrays that are already
+    sorted by votes, so startup does not parse cross_references.txt.
+    """
+
+    def __init__(self, path):
+        arrays, metadata = open_bundle(path)
+        self.verse_ids = arrays['verse_ids']
+        self.indptr = arrays['indptr']
+        self.target_ids = arrays['target_ids']
+        self.votes = arrays['votes']
+        self.book_names = [b['name'] for b in metadata['books']]
+        self.book_numbers = {name: i + 1 for i, name in enumerate(self.book_names)}
+
+    def __len__(self):
+        # Verses with at least one outgoing reference
+        return int(np.count_nonzero(np.diff(self.indptr)))
+
+    def verse_name(self, verse_id):
+        book, rest = divmod(int(verse_id), 1000000)
+        chapter, verse = divmod(rest, 1000)
+        return f"{self.book_names[book - 1]} {chapter}:{verse}"
+
+    def get(self, reference, default=None):
+        try:
+            book, chapter_verse = reference.rsplit(' ', 1)
+            chapter, verse = chapter_verse.split(':')
+            verse_id = self.book_numbers[book] * 1000000 + int(chapter) * 1000 + int(verse)
+        except (KeyError, ValueError):
+            return default
+
+        row = np.searchsorted(self.verse_ids, verse_id)
+        if row >= len(self.verse_ids) or self.verse_ids[row] != verse_id:
+            return default
+
+        start, end = self.indptr[row], self.indptr[row + 1]
+        if start == end:
+            return default
+        return [{'verse': self.verse_name(target), 'votes': int(votes)}
+                for target, votes in zip(self.target_ids[start:end], self.votes[start:end])]
+
+
 class BibleReader:
     def __init__(self):
         self.translations = {}
         self.current_translation = 'KJV'
         self.cross_refs = defaultdict(list)
+        self.sections = None
         self.daily_verses = [
             "John 3:16", "Psalms 23:1", "Philippians 4:13", "Jeremiah 29:11",
             "Romans 8:28", "Proverbs 3:5", "Isaiah 40:31", "Matthew 5:16",
@@ -268,6 +330,7 @@ class BibleReader:
 
         self.load_all_translations()
         self.load_cross_references()
+        self.load_section_index()
 
     def load_all_translations(self):
         """Load all available Bible translations"""
@@ -342,8 +405,60 @@ class BibleReader:
             return f"{book} {chapter}:{verse}"
         return ref
 
+    def load_verse_index(self):
+        """Memory-map the precomputed verse index if available"""
+        if np is None:
+            return False
+
+        for path in VERSE_INDEX_PATHS:
+            if os.path.exists(path):
+                try:
+                    self.cross_refs = VerseIndexRefs(path)
+                    print(f"{Colors.SUCCESS}  ✓ Cross-references mapped from {path} - {len(self.cross_refs):,} verses with connections{Colors.RESET}")
+                    return True
+                except Exception as e:
+                    print(f"{Colors.ERROR}  ✗ Could not open {path}: {e}{Colors.RESET}")
+        return False
+
+    def load_section_index(self):
+        """Load the pericope partition from section_index.json if available"""
+        for path in SECTION_INDEX_PATHS:
+            if os.path.exists(path):
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                    self.sections = {
+                        'start': index['partition']['start'],
+                        'end': index['partition']['end'],
+                        'book_numbers': {b['name']: i + 1 for i, b in enumerate(index['books'])}
+                    }
+                    print(f"{Colors.SUCCESS}  ✓ Sections loaded - {len(self.sections['start']):,} passages{Colors.RESET}")
+                except Exception as e:
+                    print(f"{Colors.ERROR}  ✗ Could not open {path}: {e}{Colors.RESET}")
+                return
+
+    def find_section(self, reference):
+        """Passage containing a verse, e.g. "Genesis 1:1-31" (None if unknown)"""
+        if not self.sections:
+            return None
+        try:
+            book, chapter_verse = reference.rsplit(' ', 1)
+            chapter, verse = chapter_verse.split(':')
+            verse_id = self.sections['book_numbers'][book] * 1000000 + int(chapter) * 1000 + int(verse)
+        except (KeyError, ValueError):
+            return None
+
+        row = bisect_right(self.sections['start'], verse_id) - 1
+        if row < 0 or self.sections['end'][row] < verse_id:
+            return None
+        start, end = self.sections['start'][row], self.sections['end'][row]
+        return f"{book} {start // 1000 % 1000}:{start % 1000}-{end % 1000}"
+
     def load_cross_references(self):
         """Load cross-reference data"""
+        if self.load_verse_index():
+            return
+
         try:
             with open('cross_references.txt', 'r', encoding='utf-8') as f:
                 lines = f.readlines()[1:]
@@ -416,6 +531,10 @@ class BibleReader:
             print(f"╠{'═' * 78}╣")
             print(make_border_line(ref_line))
             print(make_border_line(book_line))
+            section = self.find_section(reference)
+            if section:
+                section_line = f"{Colors.DIM_CYAN}Passage:{Colors.RESET}    {Colors.BRIGHT_WHITE}{section}{Colors.RESET}"
+                print(make_border_line(section_line))
             print(make_border_line(trans_line))
             print(make_border_line(stats_line))
             print(f"{make_border_bottom()}{Colors.RESET}\n")
@@ -71,6 +71,85 @@ async function loadStats(bucket) {
   return JSON.parse(text);
 }
 
+// Load an optional derived file (chapter_csr.json, edge_rankings.json,
+// vote_layers.json, book_pairs.json, manifest.json) from R2 (null if not uploaded)
+async function loadOptionalJson(bucket, key) {
+  const object = await bucket.get(key);
+  if (!object) {
+    return null;
+  }
+  const text = await object.text();
+  return JSON.parse(text);
+}
+
+// Edge ids from sourceBook to targetBook (book indices), heaviest first
+function bookPairEdgeIds(pairs, sourceBook, targetBook) {
+  const bucket = sourceBook * pairs.total_books + targetBook;
+  return pairs.order.slice(pairs.offsets[bucket], pairs.offsets[bucket + 1]);
+}
+
+// Edge ids touching a book in either direction, in graph_data.json order
+function bookEdgeIds(pairs, book) {
+  const n = pairs.total_books;
+  // Outgoing edges are one contiguous run of buckets
+  const ids = pairs.order.slice(pairs.offsets[book * n], pairs.offsets[book * n + n]);
+  for (let source = 0; source < n; source++) {
+    if (source !== book) {
+      ids.push(...bookPairEdgeIds(pairs, source, book));
+    }
+  }
+  return ids.sort((a, b) => a - b);
+}
+
+// Number of edges with net votes >= minVotes (net_sorted is descending)
+function countAtLeast(netSorted, minVotes) {
+  let lo = 0;
+  let hi = netSorted.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (netSorted[mid] >= minVotes) {
+      lo = mid + 1;
+    } else {
+      hi = mid;
+    }
+  }
+  return lo;
+}
+
+// Load one book or chapter shard from R2
+async function loadShard(bucket, key) {
+  const object = await bucket.get(key);
+  if (!object) {
+    throw new Error(`Shard not found: ${key}`);
+  }
+  const text = await object.text();
+  return JSON.parse(text);
+}
+
+// Rebuild the graph_data.json chapter list from the books of
+// manifest.json or chapter_csr.json
+function chaptersFromManifest(manifest) {
+  const chapters = [];
+  manifest.books.forEach((book, bookIndex) => {
+    for (let ch = 1; ch <= book.chapters; ch++) {
+      chapters.push({
+        id: chapters.length,
+        label: `${book.name} ${ch}`,
+        book: book.name,
+        chapter: ch,
+        book_index: bookIndex,
+        testament: book.testament
+      });
+    }
+  });
+  return chapters;
+}
+
+// Manifest books without the shard bookkeeping fields
+function booksFromManifest(manifest) {
+  return manifest.books.map(({ name, abbrev, chapters, testament }) => ({ name, abbrev, chapters, testament }));
+}
+
 // Load theographic data from R2
 async function loadTheographicData(bucket, filename) {
   const object = await bucket.get(`theographic/${filename}`);
@@ -81,15 +160,40 @@ async function loadTheographicData(bucket, filename) {
   return JSON.parse(text);
 }
 
-// /api/graph?testament=OT|NT|all&limit=1000 - Get filtered cross-reference connections
+// /api/graph?testament=OT|NT|all&limit=1000&minVotes=10 - Get filtered cross-reference connections
 async function handleGraph(url, bucket, headers) {
   const testament = url.searchParams.get('testament') || 'all';
   const limit = parseInt(url.searchParams.get('limit') || '1000');
   const minWeight = parseInt(url.searchParams.get('minWeight') || '1');
+  const minVotesParam = url.searchParams.get('minVotes');
+  const minVotes = minVotesParam === null ? null : parseInt(minVotesParam);
+  if (Number.isNaN(minVotes)) {
+    return new Response(JSON.stringify({ error: 'Invalid parameter: minVotes' }), {
+      status: 400,
+      headers,
+    });
+  }
 
-  const graphData = await loadGraphData(bucket);
+  const [graphData, layers] = await Promise.all([
+    loadGraphData(bucket),
+    minVotes === null ? null : loadOptionalJson(bucket, 'vote_layers.json')
+  ]);
   let connections = graphData.connections;
 
+  // Filter by net votes: the edges at or above a threshold are a prefix of net_order.
+  // graph_data.json weights are summed absolute votes, so without the layers
+  // net votes are unknown
+  if (minVotes !== null) {
+    if (!layers) {
+      return new Response(JSON.stringify({ error: 'minVotes needs vote_layers.json, which is not uploaded' }), {
+        status: 501,
+        headers,
+      });
+    }
+    const count = countAtLeast(layers.net_sorted, minVotes);
+    connections = layers.net_order.slice(0, count).map(index => connections[index]);
+  }
+
   // Filter by testament
   if (testament !== 'all') {
     connections = connections.filter(conn => {
@@ -122,6 +226,7 @@ async function handleGraph(url, bucket, headers) {
       testament: testament,
       limit: limit,
       minWeight: minWeight,
+      minVotes: minVotes,
       results: connections.length
     },
     books: graphData.books,
@@ -148,9 +253,11 @@ async function handleStats(url, bucket, headers) {
   });
 }
 
-// /api/book?name=Genesis - Get all connections for a specific book
+// /api/book?name=Genesis[&target=Matthew] - Get all connections for a specific book,
+// or only those from it to the target book (heaviest first)
 async function handleBook(url, bucket, headers) {
   const bookName = url.searchParams.get('name');
+  const targetName = url.searchParams.get('target');
   if (!bookName) {
     return new Response(JSON.stringify({ error: 'Missing parameter: name' }), {
       status: 400,
@@ -158,21 +265,57 @@ async function handleBook(url, bucket, headers) {
     });
   }
 
-  const graphData = await loadGraphData(bucket);
+  let connections, chapters, books;
+  const manifest = targetName ? null : await loadOptionalJson(bucket, 'manifest.json');
+  const entry = manifest && manifest.books.find(book => book.name === bookName);
+
+  if (entry) {
+    // Only this book's edges are fetched
+    const shard = await loadShard(bucket, entry.file);
+    connections = shard.connections;
+    chapters = chaptersFromManifest(manifest);
+    books = booksFromManifest(manifest);
+  } else {
+    const [graphData, pairs] = await Promise.all([loadGraphData(bucket), loadOptionalJson(bucket, 'book_pairs.json')]);
+    chapters = graphData.chapters;
+    books = graphData.books;
+
+    const bookIndex = books.findIndex(book => book.name === bookName);
+    const targetIndex = targetName ? books.findIndex(book => book.name === targetName) : -1;
+    if (bookIndex < 0 || (targetName && targetIndex < 0)) {
+      return new Response(JSON.stringify({ error: `Unknown book: ${bookIndex < 0 ? bookName : targetName}` }), {
+        status: 404,
+        headers,
+      });
+    }
 
-  // Filter connections by book
-  const connections = graphData.connections.filter(conn => {
-    const sourceChapter = graphData.chapters[conn.source];
-    const targetChapter = graphData.chapters[conn.target];
-    return sourceChapter.book === bookName || targetChapter.book === bookName;
-  });
+    if (pairs) {
+      // Direct range reads into the book-pair buckets
+      const ids = targetName ? bookPairEdgeIds(pairs, bookIndex, targetIndex) : bookEdgeIds(pairs, bookIndex);
+      connections = ids.map(id => graphData.connections[id]);
+    } else {
+      // Filter connections by book
+      connections = graphData.connections.filter(conn => {
+        const sourceChapter = graphData.chapters[conn.source];
+        const targetChapter = graphData.chapters[conn.target];
+        if (targetName) {
+          return sourceChapter.book === bookName && targetChapter.book === targetName;
+        }
+        return sourceChapter.book === bookName || targetChapter.book === bookName;
+      });
+      if (targetName) {
+        connections.sort((a, b) => b.weight - a.weight);
+      }
+    }
+  }
 
   return new Response(JSON.stringify({
     book: bookName,
+    ...(targetName && { target: targetName }),
     connections: connections.length,
     results: connections,
-    chapters: graphData.chapters,
-    books: graphData.books
+    chapters: chapters,
+    books: books
   }), {
     headers: {
       ...headers,
@@ -191,21 +334,61 @@ async function handleChapter(url, bucket, headers) {
     });
   }
 
-  const graphData = await loadGraphData(bucket);
+  const manifest = await loadOptionalJson(bucket, 'manifest.json');
+  if (manifest && chapterId >= 0 && chapterId < manifest.total_chapters) {
+    // Only this chapter's edges are fetched
+    const shard = await loadShard(bucket, manifest.chapter_file.replace('{id}', chapterId));
+    return new Response(JSON.stringify({
+      chapter: shard.chapter,
+      connections: shard.connections.length,
+      results: shard.connections,
+      chapters: chaptersFromManifest(manifest),
+      books: booksFromManifest(manifest)
+    }), {
+      headers: {
+        ...headers,
+        'Cache-Control': 'public, max-age=3600',
+      },
+    });
+  }
 
-  // Filter connections by chapter
-  const connections = graphData.connections.filter(conn =>
-    conn.source === chapterId || conn.target === chapterId
-  );
+  const csr = await loadOptionalJson(bucket, 'chapter_csr.json');
+  // Older uploads of chapter_csr.json have no book list; use graph_data.json then
+  const graphData = csr && csr.books ? null : await loadGraphData(bucket);
+  const chapters = graphData ? graphData.chapters : chaptersFromManifest(csr);
+  const books = graphData ? graphData.books : booksFromManifest(csr);
+  if (chapterId < 0 || chapterId >= chapters.length) {
+    return new Response(JSON.stringify({ error: `Unknown chapter: ${chapterId}` }), {
+      status: 404,
+      headers,
+    });
+  }
 
-  const chapter = graphData.chapters[chapterId];
+  let connections;
+  if (csr) {
+    // Outgoing then incoming edges: two slices instead of a full scan
+    connections = [];
+    const out = csr.out;
+    for (let i = out.indptr[chapterId]; i < out.indptr[chapterId + 1]; i++) {
+      connections.push({ source: chapterId, target: out.indices[i], weight: out.weights[i] });
+    }
+    const incoming = csr.in;
+    for (let i = incoming.indptr[chapterId]; i < incoming.indptr[chapterId + 1]; i++) {
+      connections.push({ source: incoming.indices[i], target: chapterId, weight: incoming.weights[i] });
+    }
+  } else {
+    // Filter connections by chapter
+    connections = graphData.connections.filter(conn =>
+      conn.source === chapterId || conn.target === chapterId
+    );
+  }
 
   return new Response(JSON.stringify({
-    chapter: chapter,
+    chapter: chapters[chapterId],
     connections: connections.length,
     results: connections,
-    chapters: graphData.chapters,
-    books: graphData.books
+    chapters: chapters,
+    books: books
   }), {
     headers: {
       ...headers,
@@ -245,12 +428,14 @@ async function handleTheographic(url, bucket, headers) {
 
 // /api/preview - Get preview data (top 200 connections)
 async function handlePreview(url, bucket, headers) {
-  const graphData = await loadGraphData(bucket);
+  const [graphData, rankings] = await Promise.all([loadGraphData(bucket), loadOptionalJson(bucket, 'edge_rankings.json')]);
 
-  // Get top 200 strongest connections
-  const topConnections = graphData.connections
-    .sort((a, b) => b.weight - a.weight)
-    .slice(0, 200);
+  // Get top 200 strongest connections (a slice of the precomputed ranking if uploaded)
+  const topConnections = rankings
+    ? rankings.weight_order.slice(0, 200).map(i => graphData.connections[i])
+    : graphData.connections
+      .sort((a, b) => b.weight - a.weight)
+      .slice(0, 200);
 
   return new Response(JSON.stringify({
     metadata: {
@@ -278,9 +463,9 @@ function handleRoot(headers) {
     github: 'https://github.com/Ringmast4r/BIBLE',
     website: 'https://getproselytized.com',
     endpoints: {
-      '/api/graph': 'Get cross-reference connections. Params: ?testament=OT|NT|all&limit=1000&minWeight=1',
+      '/api/graph': 'Get cross-reference connections. Params: ?testament=OT|NT|all&limit=1000&minWeight=1&minVotes=10 (net votes, strongest first)',
       '/api/stats': 'Get comprehensive statistics',
-      '/api/book': 'Get all connections for a book. Params: ?name=Genesis',
+      '/api/book': 'Get all connections for a book. Params: ?name=Genesis&target=Matthew (optional: only Genesis -> Matthew, heaviest first)',
       '/api/chapter': 'Get all connections for a chapter. Params: ?id=123',
       '/api/theographic': 'Get theographic data. Params: ?type=people|places|events|periods|peopleGroups|verses|chapters|books|easton',
       '/api/preview': 'Get preview data (top 200 connections)',
@@ -288,6 +473,7 @@ function handleRoot(headers) {
     examples: [
       '/api/graph?testament=NT&limit=500',
       '/api/book?name=John',
+      '/api/book?name=Isaiah&target=Matthew',
       '/api/chapter?id=1',
       '/api/theographic?type=people',
       '/api/preview',